@@ -1,23 +1,40 @@
 import weakref
 
-from PySide2.QtCore import QObject, QUrl, qDebug, qCritical, QEvent, QPointF, Qt, Signal
+from PySide2.QtCore import QObject, QUrl, qDebug, qCritical, QEvent, QPointF, Qt, QTimer, Signal, Slot, Property
 from PySide2.QtGui import QColor, QMouseEvent, QWheelEvent
 from PySide2.QtQuick import QQuickFramebufferObject
 
-from QMLPyVista.QVTKFramebufferObjectRenderer import FboRenderer
+from QMLPyVista.QVTKFramebufferObjectRenderer import FboRenderer, LazyRendererList
+from QMLPyVista.lookup_tables import LookupTableCache
+from QMLPyVista.memory import renderer_memory
+from QMLPyVista.scalar_bars import ScalarBarRegistry
 from pyvista import BasePlotter, np, try_callback
 from functools import wraps, partial
 from typing import Any
-import vtk
+from vtkmodules import vtkInteractionStyle
+from vtkmodules.vtkRenderingCore import vtkTexture
+from vtkmodules.vtkRenderingOpenGL2 import vtkGenericOpenGLRenderWindow
+try:
+    from vtkmodules.vtkRenderingUI import vtkGenericRenderWindowInteractor
+except ImportError:
+    # VTK < 9
+    from vtkmodules.vtkRenderingCore import vtkGenericRenderWindowInteractor
 
 
 class FboItem(QQuickFramebufferObject, BasePlotter):
     rendererInitialized = Signal()
+    _cameraMoved = Signal()
+    _bricksReady = Signal()
 
     def __init__(self, *args, **kwargs):
         qDebug('FboItem::__init__')
         QQuickFramebufferObject.__init__(self)
         self._vtkFboRenderer = None
+        self._lazy_shadow_renderer = None
+        self._static_batching = False
+        self._culling_min_pixels = None
+        self._lookup_tables = LookupTableCache()
+        self._scalar_bar_registry = ScalarBarRegistry(self._lookup_tables)
         BasePlotter.__init__(self, *args, **kwargs)
 
         self._opts = {
@@ -28,14 +45,41 @@ class FboItem(QQuickFramebufferObject, BasePlotter):
         common_keys = self._opts.keys() & kwargs.keys()
         common_dict = {k: kwargs[k] for k in common_keys}
         self._opts.update(common_dict)
+        # Created on first use, like the scene model, to keep startup light
+        self._textures = None
 
-        self.ren_win = vtk.vtkGenericOpenGLRenderWindow = vtk.vtkGenericOpenGLRenderWindow()
-        self.iren: vtk.vtkGenericRenderWindowInteractor = vtk.vtkGenericRenderWindowInteractor()
+        self.ren_win: vtkGenericOpenGLRenderWindow = vtkGenericOpenGLRenderWindow()
+        self.iren: vtkGenericRenderWindowInteractor = vtkGenericRenderWindowInteractor()
         self.iren.EnableRenderOff()
         self.ren_win.SetInteractor(self.iren)
 
         self.update_style()
 
+        self._bricked_volumes = {}
+        self._plane_filters = {}
+        self._time_series = {}
+        self._point_clouds = {}
+        self._probe_cache = {}
+        self._frame_hooks = []
+        self._ingests = {}
+        # Polls the shared memory channels for frames newer than the displayed ones
+        self._ingest_timer = QTimer(self)
+        self._ingest_timer.setInterval(16)
+        self._ingest_timer.timeout.connect(self._poll_ingests)
+        self._probe_frame = None
+        # Ask for another frame while a point cloud still refines
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setInterval(100)
+        self._refine_timer.timeout.connect(self._refine_point_clouds)
+
+        self._scene_model = None
+        # Interaction events fire on the render thread, streaming happens on ours
+        self._cameraMoved.connect(self.update_bricked_volumes, Qt.QueuedConnection)
+        for event in ('LeftButtonReleaseEvent', 'MouseWheelForwardEvent', 'MouseWheelBackwardEvent'):
+            self.iren.AddObserver(event, lambda *args: self._cameraMoved.emit())
+        # Brick workers ask for the frame that swaps their bricks in
+        self._bricksReady.connect(self.update, Qt.QueuedConnection)
+
         self.__m_lastMouseLeftButton: QMouseEvent = QMouseEvent(QEvent.Type.None_, QPointF(0, 0), Qt.NoButton,
                                                                 Qt.NoButton, Qt.NoModifier)
         self.__m_lastMouseButton: QMouseEvent = QMouseEvent(QEvent.Type.None_, QPointF(0, 0), Qt.NoButton, Qt.NoButton,
@@ -50,6 +94,7 @@ class FboItem(QQuickFramebufferObject, BasePlotter):
     def createRenderer(self):
         qDebug('FboItem::createRenderer')
         renderers = []
+        viewports = []
         # Create subplot renderers
         row_weights = np.ones(self.shape[0])
         col_weights = np.ones(self.shape[1])
@@ -82,25 +127,49 @@ class FboItem(QQuickFramebufferObject, BasePlotter):
                         renderer.setVtkFboItem(self)
                         mren = renderer.renderer
                         self.ren_win.AddRenderer(mren)
+                        mren.SetViewport(x0, y0, x1, y1)
                         self._vtkFboRenderer = renderer
                     else:
-                        mren = self._vtkFboRenderer.create_renderer(**self._opts)
-                        self.ren_win.AddRenderer(mren)
-                    mren.SetViewport(x0, y0, x1, y1)
+                        # Other subplots are created the first time they are accessed
+                        mren = None
                     self._render_idxs[row, col] = len(renderers)
                     renderers.append(mren)
+                    viewports.append((x0, y0, x1, y1))
                 else:
                     self._render_idxs[row, col] = self._render_idxs[self.groups[group, 0], self.groups[group, 1]]
                 idx += 1
-        self.renderers = renderers
-        # create a shadow renderer that lives on top of all others
-        qDebug('FboItem::shadowRenderer')
-        self._shadow_renderer = self._vtkFboRenderer.create_renderer(**self._opts)
-        self._shadow_renderer.SetViewport(0, 0, 1, 1)
-        self._shadow_renderer.SetDraw(False)
+        self.renderers = LazyRendererList(renderers, viewports, self._create_subplot_renderer)
+        # The shadow renderer is created on first access
+        self._lazy_shadow_renderer = None
         self.rendererInitialized.emit()
         return self._vtkFboRenderer
 
+    def _create_subplot_renderer(self, viewport):
+        qDebug('FboItem::subplotRenderer')
+        renderer = self._vtkFboRenderer.create_renderer(**self._opts)
+        self.ren_win.AddRenderer(renderer)
+        renderer.SetViewport(*viewport)
+        # Follow the settings made before the subplot existed
+        if self._static_batching:
+            renderer.enable_static_batching()
+        if self._culling_min_pixels is not None:
+            renderer.enable_culling(self._culling_min_pixels)
+        return renderer
+
+    @property
+    def _shadow_renderer(self):
+        # create a shadow renderer that lives on top of all others
+        if self._lazy_shadow_renderer is None and self._vtkFboRenderer is not None:
+            qDebug('FboItem::shadowRenderer')
+            self._lazy_shadow_renderer = self._vtkFboRenderer.create_renderer(**self._opts)
+            self._lazy_shadow_renderer.SetViewport(0, 0, 1, 1)
+            self._lazy_shadow_renderer.SetDraw(False)
+        return self._lazy_shadow_renderer
+
+    @_shadow_renderer.setter
+    def _shadow_renderer(self, value):
+        self._lazy_shadow_renderer = value
+
     @property
     def _active_renderer_index(self):
         if self._vtkFboRenderer is None:
@@ -131,6 +200,57 @@ class FboItem(QQuickFramebufferObject, BasePlotter):
             return None
         return self._vtkFboRenderer.renderer
 
+    @property
+    def _scalar_bar_mappers(self):
+        return self._scalar_bar_registry.mappers
+
+    @_scalar_bar_mappers.setter
+    def _scalar_bar_mappers(self, value):
+        self._scalar_bar_registry.set_mappers(value)
+
+    @property
+    def _scalar_bar_ranges(self):
+        return self._scalar_bar_registry.ranges
+
+    @_scalar_bar_ranges.setter
+    def _scalar_bar_ranges(self, value):
+        self._scalar_bar_registry.ranges = value
+
+    @property
+    def _scalar_bar_slot_lookup(self):
+        return self._scalar_bar_registry.slot_lookup
+
+    @_scalar_bar_slot_lookup.setter
+    def _scalar_bar_slot_lookup(self, value):
+        self._scalar_bar_registry.slot_lookup = value
+
+    @property
+    def _scalar_bar_slots(self):
+        return self._scalar_bar_registry.slots
+
+    @_scalar_bar_slots.setter
+    def _scalar_bar_slots(self, value):
+        self._scalar_bar_registry.slots = value
+
+    @property
+    def _scalar_bar_actors(self):
+        return self._scalar_bar_registry.actors
+
+    @_scalar_bar_actors.setter
+    def _scalar_bar_actors(self, value):
+        self._scalar_bar_registry.actors = value
+
+    def _get_scene_model(self):
+        if self._scene_model is None:
+            from QMLPyVista.scene_model import SceneModel
+
+            self._scene_model = SceneModel(self)
+            self._scene_model.sceneChanged.connect(self.update)
+        return self._scene_model
+
+    # Edited from QML or Python, differences are applied once per frame in FboRenderer.synchronize
+    sceneModel = Property(QObject, _get_scene_model, constant=True)
+
     def isInitialized(self) -> bool:
         return isinstance(self.renderers[self._active_renderer_index], FboRenderer)
 
@@ -144,9 +264,12 @@ class FboItem(QQuickFramebufferObject, BasePlotter):
     #     return self.render_signal.emit()
 
     def set_subplots(self, shape=(1, 1)):
-        my_renderers = np.array(self.renderers)
+        # Subplots which were never shown stay uncreated
+        my_renderers = np.empty(len(self.renderers), dtype=object)
+        my_renderers[:] = getattr(self.renderers, 'entries', self.renderers)
         my_renderers = my_renderers.reshape(self.shape)
         renderers = []
+        viewports = []
 
         row_weights = np.ones(shape[0])
         col_weights = np.ones(shape[1])
@@ -173,23 +296,422 @@ class FboItem(QQuickFramebufferObject, BasePlotter):
                     nb_cols = 1
                 if nb_rows is not None:
                     if row >= my_renderers.shape[0] or col >= my_renderers.shape[1]:
-                        print('Created another renderer')
-                        renderer = self._vtkFboRenderer.create_renderer(**self._opts)
-                        self.ren_win.AddRenderer(renderer)
+                        renderer = None
                     else:
                         renderer = my_renderers[row, col]
                     x0 = col_off[col]
                     y0 = row_off[row + nb_rows]
                     x1 = col_off[col + nb_cols]
                     y1 = row_off[row]
-                    renderer.SetViewport(x0, y0, x1, y1)
+                    if renderer is not None:
+                        renderer.SetViewport(x0, y0, x1, y1)
                     self._render_idxs[row, col] = len(renderers)
                     renderers.append(renderer)
+                    viewports.append((x0, y0, x1, y1))
                 else:
                     self._render_idxs[row, col] = self._render_idxs[self.groups[group, 0], self.groups[group, 1]]
-        self.renderers = renderers
+        for renderer in my_renderers.ravel():
+            if renderer is not None and not any(renderer is kept for kept in renderers):
+                self._vtkFboRenderer.discard_renderer(renderer)
+        for renderer in self._background_renderers:
+            if renderer is not None:
+                self._vtkFboRenderer.discard_renderer(renderer)
+        self.renderers = LazyRendererList(renderers, viewports, self._create_subplot_renderer)
         self.shape = (shape[0], shape[1])
         self._background_renderers = [None for _ in range(len(self.renderers))]
+        self.update()
+
+    def memory_usage(self) -> dict:
+        """Return the estimated CPU and GPU bytes held by each renderer and actor.
+
+        Data shared between actors is only counted once on the CPU side.
+        """
+        seen = set()
+        renderers = [renderer_memory(renderer, seen) for renderer in getattr(self.renderers, 'created', self.renderers)]
+        return {
+            'cpu': sum(usage['cpu'] for usage in renderers),
+            'gpu': sum(usage['gpu'] for usage in renderers),
+            'renderers': renderers,
+        }
+
+    def enable_static_batching(self):
+        """Batch static, non-pickable actors in every renderer."""
+        self._static_batching = True
+        for renderer in getattr(self.renderers, 'created', self.renderers):
+            renderer.enable_static_batching()
+
+    def disable_static_batching(self):
+        self._static_batching = False
+        for renderer in getattr(self.renderers, 'created', self.renderers):
+            renderer.disable_static_batching()
+
+    def enable_culling(self, min_pixels=1.0):
+        """Cull actors outside the view or under ``min_pixels`` on screen, in every renderer."""
+        self._culling_min_pixels = min_pixels
+        for renderer in getattr(self.renderers, 'created', self.renderers):
+            renderer.enable_culling(min_pixels)
+
+    def disable_culling(self):
+        self._culling_min_pixels = None
+        for renderer in getattr(self.renderers, 'created', self.renderers):
+            renderer.disable_culling()
+
+    @property
+    def culled(self) -> int:
+        """Number of actors culled from the last frame."""
+        return sum(getattr(renderer, 'culled', 0) for renderer in getattr(self.renderers, 'created', self.renderers))
+
+    def lookup_table(self, cmap, n_colors=256, clim=None, flip=False, nan_color=None, below_color=None,
+                     above_color=None, nan_opacity=1.0, log_scale=False, private=False):
+        """Return a shared lookup table from the item's colormap cache.
+
+        Pass ``private=True`` for a copy which is not shared with other
+        actors or scalar bars.
+        """
+        return self._lookup_tables.get(cmap, n_colors=n_colors, clim=clim, flip=flip, nan_color=nan_color,
+                                       below_color=below_color, above_color=above_color, nan_opacity=nan_opacity,
+                                       log_scale=log_scale, private=private)
+
+    def add_mesh(self, mesh, *args, shared_lut=True, shared_texture=True, mipmap=False, **kwargs):
+        """Wrap ``BasePlotter.add_mesh`` to share lookup tables and textures between meshes.
+
+        Named colormaps are resolved once and the resulting table is taken
+        from the item's cache, so meshes re-added with the same colormap,
+        number of colors and range share one ``vtkLookupTable``. Set
+        ``shared_lut=False`` to keep the table private to this mesh.
+
+        Likewise a ``texture`` given as an array or a ``vtkTexture`` is
+        looked up by content in the item's texture cache, with ``mipmap``
+        filtering if asked for. Set ``shared_texture=False`` to upload it
+        on its own.
+        """
+        cmap = kwargs.get('cmap', kwargs.get('colormap'))
+        opacity = kwargs.get('opacity', 1.0)
+        shared_lut = (shared_lut and isinstance(cmap, str) and isinstance(opacity, (int, float))
+                      and not kwargs.get('categories') and not kwargs.get('annotations'))
+        if shared_lut:
+            kwargs['cmap' if 'cmap' in kwargs else 'colormap'] = self._lookup_tables.colormap(cmap)
+        shared_texture = shared_texture and isinstance(kwargs.get('texture'), (np.ndarray, vtkTexture))
+        if shared_texture:
+            kwargs['texture'] = self._texture_cache().get(kwargs['texture'], mipmap=mipmap)
+        actor = BasePlotter.add_mesh(self, mesh, *args, **kwargs)
+        if shared_lut and actor is not None:
+            self._share_lookup_table(actor, cmap, kwargs)
+        if shared_texture and actor is not None:
+            self._textures.acquire(actor, kwargs['texture'])
+        return actor
+
+    def add_actor(self, *args, **kwargs):
+        """Wrap ``BasePlotter.add_actor``, applying the scene model entry of the actor's name."""
+        result = BasePlotter.add_actor(self, *args, **kwargs)
+        name = kwargs.get('name', args[2] if len(args) > 2 else None)
+        if name is not None and self._scene_model is not None:
+            self._scene_model.actor_added(name)
+        return result
+
+    @property
+    def texture_budget(self) -> int:
+        """GPU memory in bytes the texture cache may hold, unused textures beyond it are released."""
+        return self._texture_cache().budget
+
+    @texture_budget.setter
+    def texture_budget(self, value):
+        self._texture_cache().set_budget(value)
+
+    def _texture_cache(self):
+        if self._textures is None:
+            from QMLPyVista.textures import TextureCache
+
+            self._textures = TextureCache(release=self._release_texture)
+        return self._textures
+
+    def _release_texture(self, texture):
+        if self._vtkFboRenderer is not None:
+            self._vtkFboRenderer.release_graphics_resources(texture)
+
+    def add_scalar_bar(self, title=None, *args, **kwargs):
+        """Wrap ``BasePlotter.add_scalar_bar``.
+
+        When a bar with ``title`` already exists the mapper is attached to
+        it through the scalar-bar registry, the range update across all
+        of its mappers is deferred to the next frame.
+        """
+        mapper = kwargs.get('mapper') or getattr(self, 'mapper', None)
+        if title is not None and mapper is not None and title in self._scalar_bar_registry.ranges:
+            self._scalar_bar_registry.add_mapper(title, mapper)
+            self.update()
+            return
+        return BasePlotter.add_scalar_bar(self, title, *args, **kwargs)
+
+    def update_scalar_bar_range(self, clim, name=None):
+        """Update the value range of the active or named scalar bar.
+
+        Named updates are batched and applied once per frame.
+        """
+        if isinstance(clim, (int, float)):
+            clim = [-clim, clim]
+        if len(clim) != 2:
+            raise TypeError('clim argument must be a length 2 iterable of values: (min, max).')
+        if name is None:
+            if not hasattr(self, 'mapper'):
+                raise AttributeError('This plotter does not have an active mapper.')
+            old_table = self.mapper.GetLookupTable()
+            table = self._scalar_bar_registry.set_mapper_range(self.mapper, clim)
+            if table is not old_table:
+                for scalar_bar in self._scalar_bar_actors.values():
+                    if scalar_bar.GetLookupTable() is old_table:
+                        scalar_bar.SetLookupTable(table)
+            return
+        if name not in self._scalar_bar_registry.mappers:
+            raise KeyError(f'Name ({name}) not valid/not found in this plotter.')
+        self._scalar_bar_registry.set_range(name, clim)
+        self.update()
+
+    def _share_lookup_table(self, actor, cmap, kwargs):
+        mapper = actor.GetMapper()
+        old_table = mapper.GetLookupTable()
+        table = self.lookup_table(cmap, n_colors=kwargs.get('n_colors', 256), clim=mapper.GetScalarRange(),
+                                  flip=kwargs.get('flip_scalars', False), nan_color=kwargs.get('nan_color'),
+                                  below_color=kwargs.get('below_color'), above_color=kwargs.get('above_color'),
+                                  nan_opacity=kwargs.get('nan_opacity', 1.0), log_scale=kwargs.get('log_scale', False))
+        mapper.SetLookupTable(table)
+        for scalar_bar in self._scalar_bar_actors.values():
+            if scalar_bar.GetLookupTable() == old_table:
+                scalar_bar.SetLookupTable(table)
+
+    def add_mesh_clip_plane(self, mesh, normal='x', invert=False, widget_color=None, value=0.0,
+                            assign_to_axis=None, tubing=False, origin_translation=True, outline_translation=False,
+                            implicit=True, asynchronous=True, preview_rate=4, **kwargs):
+        """Clip a mesh with a plane widget, see ``BasePlotter.add_mesh_clip_plane``.
+
+        With ``asynchronous`` the clipping runs on a worker thread instead
+        of the interactor callback, only for the latest widget position.
+        Image data is previewed at ``1 / preview_rate`` resolution while
+        dragging.
+        """
+        if not asynchronous:
+            return BasePlotter.add_mesh_clip_plane(
+                self, mesh, normal=normal, invert=invert, widget_color=widget_color, value=value,
+                assign_to_axis=assign_to_axis, tubing=tubing, origin_translation=origin_translation,
+                outline_translation=outline_translation, implicit=implicit, **kwargs)
+        widget_kwargs = dict(normal=normal, color=widget_color, value=value, assign_to_axis=assign_to_axis,
+                             tubing=tubing, origin_translation=origin_translation,
+                             outline_translation=outline_translation, implicit=implicit)
+        return self._add_plane_filter(mesh, 'clip', widget_kwargs, invert=invert, preview_rate=preview_rate,
+                                      **kwargs)
+
+    def add_mesh_slice(self, mesh, normal='x', generate_triangles=False, widget_color=None, assign_to_axis=None,
+                       tubing=False, origin_translation=True, outline_translation=False, implicit=True,
+                       normal_rotation=True, asynchronous=True, preview_rate=4, **kwargs):
+        """Slice a mesh with a plane widget, see ``BasePlotter.add_mesh_slice``.
+
+        ``asynchronous`` and ``preview_rate`` are as for :meth:`add_mesh_clip_plane`.
+        """
+        if not asynchronous:
+            return BasePlotter.add_mesh_slice(
+                self, mesh, normal=normal, generate_triangles=generate_triangles, widget_color=widget_color,
+                assign_to_axis=assign_to_axis, tubing=tubing, origin_translation=origin_translation,
+                outline_translation=outline_translation, implicit=implicit, normal_rotation=normal_rotation,
+                **kwargs)
+        widget_kwargs = dict(normal=normal, color=widget_color, assign_to_axis=assign_to_axis, tubing=tubing,
+                             origin_translation=origin_translation, outline_translation=outline_translation,
+                             implicit=implicit, normal_rotation=normal_rotation)
+        return self._add_plane_filter(mesh, 'slice', widget_kwargs, generate_triangles=generate_triangles,
+                                      preview_rate=preview_rate, **kwargs)
+
+    def _add_plane_filter(self, mesh, kind, widget_kwargs, invert=False, generate_triangles=False, preview_rate=4,
+                          **kwargs):
+        name = kwargs.setdefault('name', mesh.memory_address)
+        # Previews and partial results must not change the color range
+        kwargs.setdefault('clim', kwargs.pop('rng', mesh.get_data_range(kwargs.get('scalars', None))))
+        mesh.set_active_scalars(kwargs.get('scalars', mesh.active_scalars_name))
+        self.remove_plane_filter(name)
+        self.add_mesh(mesh.outline(), name=f'{name}-outline', opacity=0.0)
+
+        def set_plane(normal, origin):
+            # The widget may still fire while its filter is being removed
+            plane_filter = self._plane_filters.get(name)
+            if plane_filter is not None and plane_filter.widget is widget:
+                plane_filter.set_plane(normal, origin)
+
+        widget = self.add_plane_widget(callback=set_plane, bounds=mesh.bounds, factor=1.25, origin=mesh.center,
+                                       test_callback=False, **widget_kwargs)
+        from QMLPyVista.async_filters import AsyncPlaneFilter
+
+        plane_filter = AsyncPlaneFilter(self, mesh, kind, name, widget.GetNormal(), widget.GetOrigin(),
+                                        invert=invert, generate_triangles=generate_triangles,
+                                        preview_rate=preview_rate, parent=self)
+        plane_filter.widget = widget
+        self._plane_filters[name] = plane_filter
+        return self.add_mesh(plane_filter.output, **kwargs)
+
+    def remove_plane_filter(self, name):
+        plane_filter = self._plane_filters.pop(name, None)
+        if plane_filter is not None:
+            plane_filter.close()
+            widget = plane_filter.widget
+            if widget is not None:
+                widget.Off()
+                if widget in getattr(self, 'plane_widgets', ()):
+                    self.plane_widgets.remove(widget)
+            self.remove_actor(name)
+
+    def _update_plane_filters(self):
+        # Called from FboRenderer.synchronize before every frame
+        for plane_filter in self._plane_filters.values():
+            plane_filter.apply_pending()
+
+    def add_bricked_volume(self, source, name='volume', plane=None, invert=False, widget=False, max_bricks=64,
+                           detail=1.0, shape=None, dtype=None, origin=(0.0, 0.0, 0.0), spacing=(1.0, 1.0, 1.0),
+                           brick_size=64, cache_bytes=512 * 2 ** 20, **kwargs):
+        """Show a large volume out-of-core.
+
+        ``source`` is a :class:`BrickedVolume`, a NumPy array, a ``.npy``
+        file or a raw file (with ``shape`` and ``dtype``). Only the bricks
+        the current camera and clip ``plane`` need are read and displayed,
+        at a resolution depending on their distance, and they are streamed
+        in again on a worker thread after every mouse release and wheel step. ``widget=True`` adds a plane
+        widget driving the clip plane, like ``add_mesh_clip_plane``. Other
+        keyword arguments are passed to ``add_mesh`` for every brick.
+        """
+        from QMLPyVista.bricks import BrickedVolume, BrickedVolumeView
+
+        if not isinstance(source, BrickedVolume):
+            source = BrickedVolume(source, shape=shape, dtype=dtype, origin=origin, spacing=spacing,
+                                   brick_size=brick_size, cache_bytes=cache_bytes)
+        self.remove_bricked_volume(name)
+        view = BrickedVolumeView(self, source, name, plane=plane, invert=invert, max_bricks=max_bricks,
+                                 detail=detail, ready=self._bricksReady.emit, **kwargs)
+        self._bricked_volumes[name] = view
+        if widget:
+            bounds = source.bounds
+            center = [(bounds[0] + bounds[1]) / 2, (bounds[2] + bounds[3]) / 2, (bounds[4] + bounds[5]) / 2]
+            normal = plane[0] if plane is not None else 'x'
+            self.add_plane_widget(callback=view.set_plane, bounds=bounds, factor=1.25, normal=normal, origin=center)
+        view.update()
+        return view
+
+    def remove_bricked_volume(self, name='volume'):
+        view = self._bricked_volumes.pop(name, None)
+        if view is not None:
+            view.close()
+
+    def update_bricked_volumes(self):
+        for view in self._bricked_volumes.values():
+            view.update()
+
+    def _update_bricked_volumes(self):
+        # Called from FboRenderer.synchronize before every frame
+        for view in self._bricked_volumes.values():
+            view.apply_pending()
+
+    def add_time_series(self, sources, name='time_series', prefetch=4, workers=2, **kwargs):
+        """Add a sequence of meshes with shared topology and show its first step.
+
+        Steps are prefetched on ``workers`` background threads into a
+        buffer of ``prefetch`` steps, and showing one only swaps its
+        changed point and data arrays into the existing actor. Other
+        keyword arguments are passed to ``add_mesh``.
+        """
+        self.remove_time_series(name)
+        from QMLPyVista.playback import TimeSeriesPlayer
+
+        player = TimeSeriesPlayer(self, sources, name, prefetch=prefetch, workers=workers, **kwargs)
+        self._time_series[name] = player
+        player.show(0)
+        return player
+
+    def remove_time_series(self, name='time_series'):
+        player = self._time_series.pop(name, None)
+        if player is not None:
+            player.close()
+            self.remove_actor(name)
+
+    @Slot(str, int)
+    def showTimeStep(self, name: str, step: int):
+        self._time_series[name].show(step)
+
+    def add_point_cloud(self, points, scalars=None, name='point_cloud', point_budget=2_000_000,
+                        interactive_budget=None, pixel_error=1.0, leaf_size=4096, **kwargs):
+        """Add a large point cloud drawn with screen-space level of detail.
+
+        ``points`` is an ``(n, 3)`` array or a :class:`PointCloudOctree`.
+        Each frame draws the octree nodes with the largest projected error
+        within ``interactive_budget`` points, and the budget grows to
+        ``point_budget`` over the following frames once the camera is idle.
+        Other keyword arguments are passed to ``add_mesh``.
+        """
+        from QMLPyVista.point_cloud import PointCloudLOD, PointCloudOctree
+
+        octree = points
+        if not isinstance(octree, PointCloudOctree):
+            octree = PointCloudOctree(points, scalars, leaf_size=leaf_size)
+        self.remove_point_cloud(name)
+        lod = PointCloudLOD(self, octree, name, point_budget=point_budget, interactive_budget=interactive_budget,
+                            pixel_error=pixel_error, **kwargs)
+        self._point_clouds[name] = lod
+        self._refine_timer.start()
+        self.update()
+        return lod
+
+    def remove_point_cloud(self, name='point_cloud'):
+        if self._point_clouds.pop(name, None) is not None:
+            self.remove_actor(name)
+        if not self._point_clouds:
+            self._refine_timer.stop()
+
+    def _update_point_clouds(self):
+        # Called from FboRenderer.synchronize before every frame
+        for lod in self._point_clouds.values():
+            lod.update()
+
+    def _refine_point_clouds(self):
+        if any(lod.refining for lod in self._point_clouds.values()):
+            self.update()
+
+    def add_ingest(self, channel, name, interval=16):
+        """Feed the mesh of the actor ``name`` from the shared memory block ``channel``.
+
+        ``channel`` is the name of a :class:`SharedFrameWriter` block,
+        usually created by a solver in another process. Every ``interval``
+        milliseconds the block is checked for new frames; the next frame
+        then maps the newest one into the mesh without copying, frames
+        superseded in between are never displayed.
+        """
+        self.remove_ingest(name)
+        from QMLPyVista.shared_frames import SharedFrameReader
+
+        reader = SharedFrameReader(channel)
+        self._ingests[name] = reader
+        self._ingest_timer.setInterval(interval)
+        self._ingest_timer.start()
+        return reader
+
+    def remove_ingest(self, name):
+        reader = self._ingests.pop(name, None)
+        if reader is not None:
+            reader.close()
+        if not self._ingests:
+            self._ingest_timer.stop()
+
+    def _update_ingests(self):
+        # Called from FboRenderer.synchronize before every frame
+        if not self._ingests:
+            return
+        from QMLPyVista.shared_frames import map_frame
+
+        for name, reader in list(self._ingests.items()):
+            frame = reader.latest()
+            if frame is None:
+                continue
+            for renderer in getattr(self.renderers, 'created', self.renderers):
+                actor = renderer._actors.get(name)
+                if actor is not None and actor.GetMapper() is not None:
+                    map_frame(actor.GetMapper().GetInput(), frame[1])
+
+    def _poll_ingests(self):
+        if any(reader.pending for reader in self._ingests.values()):
+            self.update()
 
     # #* Camera related functions
 
@@ -267,6 +789,105 @@ class FboItem(QQuickFramebufferObject, BasePlotter):
     def image(self):
         return self._vtkFboRenderer.image()
 
+    def render_batch(self, states, apply=None, size=None, filenames=None, workers=4, chunk=16, alpha=False):
+        """Render one image per entry of ``states``, back to back.
+
+        By default every state is a ``camera_position``, otherwise
+        ``apply(state)`` sets up the scene for it, e.g. from a dict of
+        parameters. Each state is rendered exactly once, ``chunk`` states
+        per trip to the render thread, at ``size`` if given.
+
+        Yields the ``(height, width, 3)`` images, or RGBA with ``alpha``.
+        With ``filenames``, a list or a pattern such as ``'frame_{:05d}.png'``,
+        the images are written by a pool of ``workers`` threads while the
+        next chunk renders, and the file names are yielded instead.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        import imageio
+
+        if apply is None:
+            def apply(position):
+                self.camera_position = position
+        states = list(states)
+        if isinstance(filenames, str):
+            filenames = [filenames.format(i) for i in range(len(states))]
+        channels = 4 if alpha else 3
+
+        def write(filename, image):
+            imageio.imwrite(filename, image[..., :channels])
+            return filename
+
+        renderer = self._vtkFboRenderer
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='render-batch') as executor:
+            pending = []
+            for start in range(0, len(states), chunk):
+                images = renderer.call_in_render_thread(renderer.render_batch, states[start:start + chunk], apply,
+                                                        size)
+                if filenames is None:
+                    for image in images:
+                        yield np.ascontiguousarray(image[..., :channels])
+                    continue
+                for i, image in enumerate(images, start):
+                    pending.append(executor.submit(write, filenames[i], image))
+                # Hand back what the workers finished while this chunk rendered
+                while pending and pending[0].done():
+                    yield pending.pop(0).result()
+            for future in pending:
+                yield future.result()
+
+    def add_frame_hook(self, hook):
+        """Call ``hook(frame, image)`` on the render thread after every rendered frame.
+
+        ``image`` is the ``(height, width, 4)`` RGBA frame, read once per
+        frame however many hooks are installed.
+        """
+        self._frame_hooks.append(hook)
+
+    def remove_frame_hook(self, hook):
+        if hook in self._frame_hooks:
+            self._frame_hooks.remove(hook)
+
+    def probe(self, pixels, scalars=False):
+        """Return the depth and world position under each ``(x, y)`` of ``pixels``.
+
+        See ``FboRenderer.probe`` for the results. They are cached until the
+        next frame, so probing the same pixel again does not wait on the
+        render thread.
+        """
+        frame = self._vtkFboRenderer._frame
+        if frame != self._probe_frame:
+            self._probe_cache = {}
+            self._probe_frame = frame
+        pixels = [(int(x), int(y)) for x, y in pixels]
+        missing = [pixel for pixel in dict.fromkeys(pixels) if (pixel, scalars) not in self._probe_cache]
+        if missing:
+            results = self._vtkFboRenderer.call_in_render_thread(self._vtkFboRenderer.probe, missing, scalars)
+            self._probe_cache.update(((pixel, scalars), result) for pixel, result in zip(missing, results))
+        return [self._probe_cache[(pixel, scalars)] for pixel in pixels]
+
+    @Slot(float, float, result='QVariant')
+    def probeAt(self, x: float, y: float):
+        """Probe the pixel under the item coordinates ``x``, ``y``, e.g. from a ``MouseArea``."""
+        result = dict(self.probe([(x, y)], scalars=True)[0])
+        result['pixel'] = list(result['pixel'])
+        if result['position'] is not None:
+            result['position'] = list(result['position'])
+        if isinstance(result.get('value'), tuple):
+            result['value'] = list(result['value'])
+        return result
+
+    def export_image(self, filename, width, height, tile_size=None, alpha=False):
+        """Render the scene at ``width`` x ``height`` into the ``.npy`` file ``filename``.
+
+        The on-screen item keeps its size, the image is rendered offscreen
+        in tiles streamed into a memory map, see ``FboRenderer.export_tiled``.
+        Returns the image, memory mapped read-only.
+        """
+        self._vtkFboRenderer.call_in_render_thread(self._vtkFboRenderer.export_tiled, filename, width, height,
+                                                   tile_size, alpha)
+        return np.load(filename, mmap_mode='r')
+
 
     # @property
     # def image(self):
@@ -300,7 +921,7 @@ def _style_factory(klass):
     # swallow the release events
     # http://vtk.1045678.n5.nabble.com/Mouse-button-release-event-is-still-broken-in-VTK-6-0-0-td5724762.html  # noqa
 
-    class CustomStyle(getattr(vtk, 'vtkInteractorStyle' + klass)):
+    class CustomStyle(getattr(vtkInteractionStyle, 'vtkInteractorStyle' + klass)):
 
         def __init__(self, parent):
             super().__init__()
@@ -326,7 +947,10 @@ def _style_factory(klass):
                 click_pos = [n_cols*click_pos[0]/rendererSize[0], -n_rows*click_pos[1]/rendererSize[1]]
                 # These are the fractional co-ords. Now we need to set the correct one active....
                 # We put renderers in by column and then row [[row], [row]]
-                for idx, renderer in enumerate(parent.renderers):
+                for idx, renderer in enumerate(getattr(parent.renderers, 'entries', parent.renderers)):
+                    if renderer is None:
+                        # Not created yet, nothing in it to interact with
+                        continue
                     cx = np.mod(idx, n_rows) + 1
                     cy = np.floor((idx + 1)/n_cols)
                     xx = np.floor(click_pos[0]/cx).astype(int)
@@ -338,7 +962,7 @@ def _style_factory(klass):
             super().OnLeftButtonUp()
             parent = self._parent()
             if len(parent.renderers) > 1:
-                for renderer in parent.renderers:
+                for renderer in getattr(parent.renderers, 'created', parent.renderers):
                     renderer.SetInteractive(True)
 
     return CustomStyle
@@ -1,25 +1,83 @@
+import math
 import random
+from contextlib import contextmanager, nullcontext
 from functools import wraps
 from typing import Any, List
 
-from PySide2.QtCore import QObject, QUrl, qDebug, qCritical, QFileInfo, QEvent, Qt, QSize, Signal
-from PySide2.QtGui import QSurfaceFormat, QColor, QMouseEvent, QWheelEvent, QOpenGLFramebufferObject, \
-    QOpenGLFramebufferObjectFormat, QOpenGLFunctions
+from PySide2.QtCore import QObject, QUrl, qDebug, qCritical, QFileInfo, QEvent, Qt, QSize, QThread, Signal
+from PySide2.QtGui import QSurfaceFormat, QColor, QMouseEvent, QWheelEvent, QOpenGLContext, \
+    QOpenGLFramebufferObject, QOpenGLFramebufferObjectFormat, QOpenGLFunctions
 from PySide2.QtQuick import QQuickFramebufferObject
 import collections.abc
 
-import vtk
+import numpy as np
+from vtkmodules.vtkCommonCore import vtkCommand, vtkUnsignedCharArray
+from vtkmodules.vtkCommonDataModel import vtkStaticPointLocator
+from vtkmodules.vtkCommonMath import vtkMatrix4x4
+from vtkmodules.vtkRenderingAnnotation import vtkCubeAxesActor
+from vtkmodules.vtkRenderingCore import vtkActor, vtkActor2D, vtkMapper, vtkProp3D
+from vtkmodules.util.numpy_support import vtk_to_numpy
 from pyvista import parse_color, rcParams
-from pyvista.plotting.renderer import Renderer, _remove_mapper_from_plotter
+from pyvista.plotting.renderer import Renderer
 from weakref import proxy
 
-from vtkmodules.util.numpy_support import vtk_to_numpy
+from QMLPyVista.batching import StaticBatch, batch_key
+from QMLPyVista.culling import BoundsTree
+
+
+class LazyRendererList(list):
+    """List of subplot renderers which builds each renderer on first access.
+
+    Entries still to be created are stored as ``None`` alongside their
+    viewport, ``factory(viewport)`` is called the first time an entry is
+    indexed or iterated over.
+    """
+
+    def __init__(self, renderers, viewports, factory):
+        super().__init__(renderers)
+        self._viewports = list(viewports)
+        self._factory = factory
+
+    def _materialize(self, index):
+        renderer = super().__getitem__(index)
+        if renderer is None:
+            renderer = self._factory(self._viewports[index])
+            super().__setitem__(index, renderer)
+        return renderer
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        return self._materialize(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._materialize(index)
+
+    @property
+    def created(self):
+        """Return the renderers built so far, without creating the others."""
+        return [renderer for renderer in super().__iter__() if renderer is not None]
+
+    @property
+    def entries(self):
+        """Return every entry, ``None`` for the renderers not created yet."""
+        return list(super().__iter__())
+
+
+def _detach_actor(actor):
+    """Drop the ``renderer`` back-reference ``RendererOPENGL.add_actor`` sets on ``actor``."""
+    try:
+        del actor.renderer
+    except AttributeError:
+        pass
 
 
 class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
 
     render_signal = Signal()
     dump_ren_win = Signal()
+    _call_signal = Signal(object)
 
     def __init__(self, render_window, interactor, *args, **kwargs):
         self.gl = QOpenGLFunctions()
@@ -45,8 +103,15 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
 
         self.render_signal.connect(self._render)
         self.dump_ren_win.connect(self._dump_ren_win)
+        # Blocks the caller until the render thread has run the call
+        self._call_signal.connect(self._run_call, Qt.BlockingQueuedConnection)
         self.__m_vtkFboItem = None
         self.__image_data = None
+        self._pending_release = []
+        self._discarded_renderers = []
+        self._frame = 0
+        self._point_locators = {}
+        self._culling_renderers = []
 
     @property
     def _scalar_bar_mappers(self):
@@ -68,6 +133,26 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
         if self.__m_vtkFboItem is not None:
             self.__m_vtkFboItem._scalar_bar_ranges = value
 
+    @property
+    def _scalar_bar_actors(self):
+        if self.__m_vtkFboItem is not None:
+            return self.__m_vtkFboItem._scalar_bar_actors
+
+    @_scalar_bar_actors.setter
+    def _scalar_bar_actors(self, value):
+        if self.__m_vtkFboItem is not None:
+            self.__m_vtkFboItem._scalar_bar_actors = value
+
+    @property
+    def _scalar_bar_registry(self):
+        if self.__m_vtkFboItem is not None:
+            return self.__m_vtkFboItem._scalar_bar_registry
+
+    @property
+    def _texture_cache(self):
+        if self.__m_vtkFboItem is not None:
+            return self.__m_vtkFboItem._textures
+
     @property
     def remove_actor(self):
         if self.__m_vtkFboItem is not None:
@@ -116,6 +201,47 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
     def create_renderer(self, *args, **kwargs) -> Renderer:
         return RendererOPENGL(parent=self, **kwargs)
 
+    def release_graphics_resources(self, prop):
+        """Release the GPU buffers of ``prop`` on the next frame.
+
+        Graphics resources can only be freed with the OpenGL context
+        current, so this is deferred to the render thread.
+        """
+        self._pending_release.append(prop)
+
+    def discard_renderer(self, renderer):
+        """Stop drawing ``renderer`` and remove it from the render window on the next frame."""
+        renderer.SetDraw(False)
+        textures = self._texture_cache
+        if textures is not None:
+            for actor in renderer._actors.values():
+                textures.release(actor)
+        self._discarded_renderers.append(renderer)
+
+    def _keep_shared_textures(self, props):
+        # Releasing a prop releases its texture, which other actors may share
+        textures = self._texture_cache
+        return nullcontext() if textures is None else textures.detached(props)
+
+    def _release_pending(self):
+        while self._pending_release:
+            prop = self._pending_release.pop()
+            with self._keep_shared_textures([prop]):
+                prop.ReleaseGraphicsResources(self._render_window)
+        while self._discarded_renderers:
+            renderer = self._discarded_renderers.pop()
+            with self._keep_shared_textures(list(renderer._actors.values())):
+                renderer.ReleaseGraphicsResources(self._render_window)
+            renderer.RemoveAllViewProps()
+            renderer.disable_culling()
+            for actor in renderer._actors.values():
+                _detach_actor(actor)
+            renderer._actors.clear()
+            owner = renderer.GetAddressAsString('')
+            for key in [key for key in self._point_locators if key[0] == owner]:
+                del self._point_locators[key]
+            self._render_window.RemoveRenderer(renderer)
+
     def setVtkFboItem(self, vtkFboItem):
         self.__m_vtkFboItem = vtkFboItem
 
@@ -131,7 +257,27 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
         return self.render_signal.emit()
 
     def image(self):
-        return self.dump_ren_win.emit()
+        return self.call_in_render_thread(self._dump_ren_win)
+
+    def call_in_render_thread(self, function, *args, **kwargs):
+        """Call ``function`` in the thread owning the OpenGL context and return its result.
+
+        Called from another thread, e.g. the GUI thread, this blocks until
+        the render thread has run it; exceptions are re-raised in the caller.
+        """
+        if QThread.currentThread() == self.thread():
+            return function(*args, **kwargs)
+        call = {'function': function, 'args': args, 'kwargs': kwargs}
+        self._call_signal.emit(call)
+        if 'error' in call:
+            raise call['error']
+        return call['result']
+
+    def _run_call(self, call):
+        try:
+            call['result'] = call['function'](*call['args'], **call['kwargs'])
+        except Exception as e:
+            call['error'] = e
 
     @property
     def iren(self):
@@ -142,6 +288,7 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
         self._render_window.PushState()
         self.openGLInitState()
         self._render_window.Start()
+        self._release_pending()
 
         # * Process camera related commands
         if self.__m_mouseEvent and not self.__m_mouseEvent.isAccepted():
@@ -156,10 +303,10 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
 
             if self.__m_mouseEvent.type() == QEvent.MouseButtonPress:
                 # qDebug('B')
-                self._interactor.InvokeEvent(vtk.vtkCommand.LeftButtonPressEvent)
+                self._interactor.InvokeEvent(vtkCommand.LeftButtonPressEvent)
             elif self.__m_mouseEvent.type() == QEvent.MouseButtonRelease:
                 # qDebug('C')
-                self._interactor.InvokeEvent(vtk.vtkCommand.LeftButtonReleaseEvent)
+                self._interactor.InvokeEvent(vtkCommand.LeftButtonReleaseEvent)
 
             self.__m_mouseEvent.accept()
 
@@ -178,7 +325,7 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
                     1 if self.__m_moveEvent.type() == QEvent.MouseButtonDblClick else 0
                 )
 
-                self._interactor.InvokeEvent(vtk.vtkCommand.MouseMoveEvent)
+                self._interactor.InvokeEvent(vtkCommand.MouseMoveEvent)
 
             self.__m_moveEvent.accept()
 
@@ -194,14 +341,24 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
             )
 
             if self.__m_wheelEvent.delta() > 0:
-                self._interactor.InvokeEvent(vtk.vtkCommand.MouseWheelForwardEvent)
+                self._interactor.InvokeEvent(vtkCommand.MouseWheelForwardEvent)
             elif self.__m_wheelEvent.delta() < 0:
-                self._interactor.InvokeEvent(vtk.vtkCommand.MouseWheelBackwardEvent)
+                self._interactor.InvokeEvent(vtkCommand.MouseWheelBackwardEvent)
 
             self.__m_wheelEvent.accept()
 
-        # Render
+        # Render only what the camera can see
+        culling = self._culling_renderers
+        for renderer in culling:
+            renderer.cull()
         self._render_window.Render()
+        for renderer in culling:
+            renderer.restore_culled()
+        self._frame += 1
+        if self.__m_vtkFboItem._frame_hooks:
+            image = self._read_pixels()
+            for hook in list(self.__m_vtkFboItem._frame_hooks):
+                hook(self._frame, image)
         self._render_window.PopState()
         self.__m_vtkFboItem.window().resetOpenGLState()
 
@@ -210,17 +367,253 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
         self._render_window.PushState()
         self.openGLInitState()
         self._render_window.Start()
+        self._release_pending()
+        self.__m_vtkFboItem._scalar_bar_registry.flush()
         # Render
         self._render_window.Render()
 
-        width, height = self._render_window.GetSize()
-        arr = vtk.vtkUnsignedCharArray()
-        self.ren_win.GetRGBACharPixelData(0, 0, width - 1, height - 1, 0, arr)
-        data = vtk_to_numpy(arr).reshape(height, width, -1)[::-1]
+        data = self._read_pixels()
         self._render_window.PopState()
         self.__m_vtkFboItem.window().resetOpenGLState()
         return data
 
+    def _read_pixels(self):
+        """Read the RGBA image of the frame just rendered, rows top down."""
+        width, height = self._render_window.GetSize()
+        arr = vtkUnsignedCharArray()
+        self._render_window.GetRGBACharPixelData(0, 0, width - 1, height - 1, 0, arr)
+        return vtk_to_numpy(arr).reshape(height, width, -1)[::-1]
+
+    @contextmanager
+    def _offscreen_target(self, size):
+        """Bind a ``size`` framebuffer with a depth buffer to render into outside of :meth:`render`.
+
+        Calls made through :meth:`call_in_render_thread` run outside of the
+        scene graph's frame, with no framebuffer of ours bound and possibly
+        without the context current. Both are undone on exit.
+        """
+        window = self.__m_vtkFboItem.window()
+        context = window.openglContext()
+        was_current = QOpenGLContext.currentContext() is context
+        if not was_current:
+            context.makeCurrent(window)
+        fmt = QOpenGLFramebufferObjectFormat()
+        fmt.setAttachment(QOpenGLFramebufferObject.Depth)
+        fbo = QOpenGLFramebufferObject(QSize(*size), fmt)
+        fbo.bind()
+        try:
+            yield fbo
+        finally:
+            fbo.release()
+            window.resetOpenGLState()
+            if not was_current:
+                context.doneCurrent()
+
+    def render_batch(self, states, apply, size=None):
+        """Render the scene once after ``apply(state)`` for each of ``states``, returning the RGBA images.
+
+        ``size`` renders at another resolution than the item. Must be
+        called in the render thread, see :meth:`call_in_render_thread`.
+        """
+        ren_win = self._render_window
+        original = tuple(ren_win.GetSize())
+        size = tuple(int(v) for v in size) if size is not None else original
+        images = []
+        with self._offscreen_target(size):
+            self._render_window.PushState()
+            self.openGLInitState()
+            self._render_window.Start()
+            self._release_pending()
+            if size != original:
+                ren_win.SetSize(*size)
+            try:
+                for state in states:
+                    apply(state)
+                    self.__m_vtkFboItem._scalar_bar_registry.flush()
+                    ren_win.Render()
+                    images.append(self._read_pixels().copy())
+            finally:
+                if size != original:
+                    ren_win.SetSize(*original)
+                self._frame += 1
+                self._render_window.PopState()
+        return images
+
+    def export_tiled(self, filename, width, height, tile_size=None, alpha=False):
+        """Render the scene at ``width`` x ``height`` pixels into the ``.npy`` file ``filename``.
+
+        The image is rendered as tiles of ``tile_size`` pixels, the current
+        size of the render window by default, each with the cameras offset
+        to their part of the image, and every tile is written straight
+        into a memory map of the output. Memory use is that of one tile,
+        whatever the size of the image. 2D props such as text and scalar
+        bars are laid out per viewport and are left out of the export.
+
+        Must be called in the render thread, see :meth:`call_in_render_thread`.
+        """
+        width, height = int(width), int(height)
+        ren_win = self._render_window
+        size = tuple(ren_win.GetSize())
+        tile_width, tile_height = (int(v) for v in (tile_size or size))
+        image = np.lib.format.open_memmap(filename, mode='w+', dtype=np.uint8, shape=(height, width, 4 if alpha else 3))
+
+        collection = ren_win.GetRenderers()
+        renderers = [collection.GetItemAsObject(i) for i in range(collection.GetNumberOfItems())]
+        saved = []
+        for renderer in renderers:
+            camera = renderer.GetActiveCamera()
+            props = renderer.GetViewProps()
+            hidden = [prop for prop in (props.GetItemAsObject(i) for i in range(props.GetNumberOfItems()))
+                      if isinstance(prop, vtkActor2D) and prop.GetVisibility()]
+            saved.append((renderer.GetViewport(), renderer.GetDraw(), camera.GetViewAngle(),
+                          camera.GetParallelScale(), camera.GetWindowCenter(), hidden))
+
+        with self._offscreen_target((tile_width, tile_height)):
+            self._render_window.PushState()
+            self.openGLInitState()
+            self._render_window.Start()
+            self._release_pending()
+            self.__m_vtkFboItem._scalar_bar_registry.flush()
+            ren_win.SetSize(tile_width, tile_height)
+            try:
+                for _, _, _, _, _, hidden in saved:
+                    for prop in hidden:
+                        prop.SetVisibility(False)
+                arr = vtkUnsignedCharArray()
+                for y0 in range(0, height, tile_height):
+                    for x0 in range(0, width, tile_width):
+                        for renderer, state in zip(renderers, saved):
+                            self._offset_tile(renderer, state, (x0, y0), (tile_width, tile_height), (width, height))
+                        ren_win.Render()
+                        ren_win.GetRGBACharPixelData(0, 0, tile_width - 1, tile_height - 1, 0, arr)
+                        # Tiles and VTK rows go bottom up, image rows top down
+                        rows, cols = min(tile_height, height - y0), min(tile_width, width - x0)
+                        tile = vtk_to_numpy(arr).reshape(tile_height, tile_width, 4)[:rows, :cols, :image.shape[2]]
+                        image[height - y0 - rows:height - y0, x0:x0 + cols] = tile[::-1]
+                    image.flush()
+            finally:
+                ren_win.SetSize(*size)
+                for renderer, (viewport, draw, view_angle, parallel_scale, center, hidden) in zip(renderers, saved):
+                    camera = renderer.GetActiveCamera()
+                    renderer.SetViewport(viewport)
+                    renderer.SetDraw(draw)
+                    camera.SetViewAngle(view_angle)
+                    camera.SetParallelScale(parallel_scale)
+                    camera.SetWindowCenter(*center)
+                    for prop in hidden:
+                        prop.SetVisibility(True)
+                self._frame += 1
+                self._render_window.PopState()
+        return image
+
+    @staticmethod
+    def _offset_tile(renderer, state, origin, tile_size, image_size):
+        """Point ``renderer`` at its part of the tile at pixel ``origin`` of the exported image."""
+        viewport, draw, view_angle, parallel_scale, center, _ = state
+        camera = renderer.GetActiveCamera()
+        clipped, scale, window_center = [], [], []
+        for axis in range(2):
+            # The viewport of the renderer in the image, in tile units
+            lower = (viewport[axis] * image_size[axis] - origin[axis]) / tile_size[axis]
+            upper = (viewport[axis + 2] * image_size[axis] - origin[axis]) / tile_size[axis]
+            visible = max(lower, 0.0), min(upper, 1.0)
+            if visible[1] <= visible[0]:
+                renderer.SetDraw(False)
+                return
+            # Fraction of the full view the tile shows and where it is centered, in NDC
+            h = (visible[1] - visible[0]) / (upper - lower)
+            middle = -1 + (visible[0] + visible[1] - 2 * lower) / (upper - lower)
+            clipped.append(visible)
+            scale.append(h)
+            window_center.append(center[axis] + middle / h)
+        renderer.SetDraw(draw)
+        renderer.SetViewport(clipped[0][0], clipped[1][0], clipped[0][1], clipped[1][1])
+        h = scale[0] if camera.GetUseHorizontalViewAngle() else scale[1]
+        camera.SetViewAngle(math.degrees(2 * math.atan(math.tan(math.radians(view_angle) / 2) * h)))
+        camera.SetParallelScale(parallel_scale * scale[1])
+        camera.SetWindowCenter(*window_center)
+
+    def probe(self, pixels, scalars=False):
+        """Return the depth and world position under each of the ``(x, y)`` ``pixels``.
+
+        Pixels are in item coordinates, origin at the top left. Only those
+        pixels are read back from the depth buffer of the last frame. Each
+        result is a dict with the ``depth``, the world ``position`` (``None``
+        over the background) and, with ``scalars``, the ``actor`` whose
+        nearest point is closest and the ``value`` of its point scalars there.
+
+        Must be called in the render thread, see :meth:`call_in_render_thread`.
+        """
+        window = self.__m_vtkFboItem.window()
+        window.openglContext().makeCurrent(window)
+        collection = self._render_window.GetRenderers()
+        renderers = [collection.GetItemAsObject(i) for i in range(collection.GetNumberOfItems())]
+        height = self._render_window.GetSize()[1]
+        results = []
+        for x, y in pixels:
+            x, y = int(x), height - 1 - int(y)
+            depth = self._render_window.GetZbufferDataAtPoint(x, y)
+            result = {'pixel': (x, height - 1 - y), 'depth': depth, 'position': None}
+            under = [r for r in renderers if r.GetDraw() and r.IsInViewport(x, y)]
+            if under and depth < 1.0:
+                renderer = max(under, key=lambda r: r.GetLayer())
+                renderer.SetDisplayPoint(x, y, depth)
+                renderer.DisplayToWorld()
+                point = renderer.GetWorldPoint()
+                result['position'] = tuple(v / point[3] for v in point[:3])
+                if scalars:
+                    result.update(self._probe_scalars(renderer, result['position']))
+            results.append(result)
+        window.resetOpenGLState()
+        return results
+
+    def _probe_scalars(self, renderer, position):
+        """Find the point scalars nearest to ``position`` among the actors of ``renderer``."""
+        best = {'actor': None, 'value': None}
+        best_distance = np.inf
+        position = np.asarray(position)
+        actors = getattr(renderer, '_synced_actors', None)
+        if actors is None:
+            actors = dict(getattr(renderer, '_actors', {}))
+        # Subplots may use the same names, only this renderer's locators are pruned
+        owner = renderer.GetAddressAsString('')
+        for key in [key for key in self._point_locators if key[0] == owner and key[1] not in actors]:
+            del self._point_locators[key]
+        for name, actor in actors.items():
+            if not isinstance(actor, vtkActor) or not actor.GetVisibility() or actor.GetMapper() is None:
+                continue
+            bounds = np.array(actor.GetBounds())
+            margin = 0.01 * np.linalg.norm(bounds[1::2] - bounds[::2])
+            if np.any(position < bounds[::2] - margin) or np.any(position > bounds[1::2] + margin):
+                continue
+            mapper = actor.GetMapper()
+            dataset = mapper.GetInput()
+            if dataset is None or dataset.GetNumberOfPoints() == 0:
+                continue
+            array = dataset.GetPointData().GetArray(mapper.GetArrayName()) or dataset.GetPointData().GetScalars()
+            if array is None:
+                continue
+            cached = self._point_locators.get((owner, name))
+            if cached is None or cached[0] is not dataset or cached[1] != dataset.GetMTime():
+                locator = vtkStaticPointLocator()
+                locator.SetDataSet(dataset)
+                locator.BuildLocator()
+                cached = self._point_locators[owner, name] = (dataset, dataset.GetMTime(), locator)
+            # Positions are in world coordinates, the points in those of the actor
+            local = position
+            if not actor.GetIsIdentity():
+                inverse = vtkMatrix4x4()
+                vtkMatrix4x4.Invert(actor.GetMatrix(), inverse)
+                local = inverse.MultiplyPoint(tuple(position) + (1.0,))[:3]
+            point_id = cached[2].FindClosestPoint(local)
+            distance = np.linalg.norm(np.array(dataset.GetPoint(point_id)) - local)
+            if distance < best_distance:
+                best_distance = distance
+                components = array.GetNumberOfComponents()
+                value = array.GetTuple(point_id)
+                best = {'actor': name, 'value': value[0] if components == 1 else value}
+        return best
+
     def synchronize(self, item: QQuickFramebufferObject):
         qDebug('ObjectRenderer: SYNC')
         rendererSize = self._render_window.GetSize()
@@ -238,6 +631,22 @@ class FboRenderer(QObject, QQuickFramebufferObject.Renderer):
         if self.__m_vtkFboItem.getLastWheelEvent() and not self.__m_vtkFboItem.getLastWheelEvent().isAccepted():
             self.__m_wheelEvent = self.__m_vtkFboItem.getLastWheelEvent()
 
+        # * Apply scene model edits made since the last frame, once QML or Python asked for the model
+        if self.__m_vtkFboItem._scene_model is not None:
+            self.__m_vtkFboItem._scene_model.apply(self.__m_vtkFboItem)
+
+        # * Per-frame scene updates, the GUI thread is blocked until they are done
+        self.__m_vtkFboItem._scalar_bar_registry.flush()
+        self.__m_vtkFboItem._update_plane_filters()
+        self.__m_vtkFboItem._update_bricked_volumes()
+        self.__m_vtkFboItem._update_point_clouds()
+        self.__m_vtkFboItem._update_ingests()
+        renderers = list(getattr(self.__m_vtkFboItem.renderers, 'created', self.__m_vtkFboItem.renderers))
+        for renderer in renderers:
+            if hasattr(renderer, 'sync_actors'):
+                renderer.sync_actors()
+        self._culling_renderers = [renderer for renderer in renderers if getattr(renderer, '_culling', False)]
+
     def createFramebufferObject(self, size):
         qDebug('ObjectRenderer: Created OpenGLFBO')
         fmt = QOpenGLFramebufferObjectFormat()
@@ -258,7 +667,310 @@ class RendererOPENGL(Renderer):
 
     def __init__(self, *args, **kwargs):
         super(RendererOPENGL, self).__init__(*args, **kwargs)
+        self._static_batching = False
+        self._static_batches = {}
+        self._static_batch_lookup = {}
+        self._static_batch_names = {}
+        self._actor_bounds = {}
+        self._scene_bounds = None
+        self._trust_bounds_cache = False
+        self._culling = False
+        self._cull_min_pixels = 1.0
+        self._bounds_tree = BoundsTree()
+        # Names whose leaf in the tree needs updating on the next sync_actors
+        self._bounds_dirty = set()
+        self._bounds_observers = {}
+        self._actor_transforms = {}
+        self._culled_actors = []
+        self._synced_actors = {}
+        self.culled = 0
 
+    @property
+    def bounds(self):
+        """Return the bounds of all actors present in the rendering window.
+
+        Scene bounds are cached and kept up to date incrementally by
+        ``add_actor``/``remove_actor``. Outside of those the per-actor
+        cache is checked against the transform of each actor and the
+        modification times of its mapper and input, so bounds are only
+        recomputed when something they depend on changed.
+        """
+        if not self._trust_bounds_cache:
+            self._validate_bounds()
+        if self._scene_bounds is None:
+            self._recompute_bounds()
+        the_bounds = self._scene_bounds.copy()
+        if np.any(np.abs(the_bounds)):
+            the_bounds[the_bounds == np.inf] = -1.0
+            the_bounds[the_bounds == -np.inf] = 1.0
+        return the_bounds.tolist()
+
+    def _is_bounded(self, actor):
+        if isinstance(actor, vtkCubeAxesActor) or actor is getattr(self, 'bounding_box_actor', None):
+            return False
+        return hasattr(actor, 'GetBounds')
+
+    def _bounded_actors(self):
+        for name, actor in self._actors.items():
+            if self._is_bounded(actor):
+                yield name, actor
+
+    @staticmethod
+    def _bounds_key(actor):
+        # Only what the bounds depend on: the transform, the mapper and its
+        # input, as updating a mesh in place does not touch the mapper.
+        # The actor MTime is left out, visibility or property changes would
+        # needlessly invalidate it.
+        mapper = actor.GetMapper() if hasattr(actor, 'GetMapper') else None
+        if mapper is None or not isinstance(actor, vtkProp3D):
+            return actor.GetMTime(),
+        data = mapper.GetInput() if hasattr(mapper, 'GetInput') else None
+        return RendererOPENGL._transform_key(actor), mapper.GetMTime(), 0 if data is None else data.GetMTime()
+
+    @staticmethod
+    def _transform_key(actor):
+        user_matrix, user_transform = actor.GetUserMatrix(), actor.GetUserTransform()
+        return (actor.GetPosition(), actor.GetOrientation(), actor.GetScale(), actor.GetOrigin(),
+                0 if user_matrix is None else user_matrix.GetMTime(),
+                0 if user_transform is None else user_transform.GetMTime())
+
+    def _cached_actor_bounds(self, name, actor):
+        cached = self._actor_bounds.get(name)
+        if cached is not None and cached[0] == self._bounds_key(actor):
+            return cached[1]
+        bounds = actor.GetBounds()
+        if bounds is not None:
+            bounds = np.array(bounds, dtype=float)
+        self._actor_bounds[name] = (self._bounds_key(actor), bounds)
+        return bounds
+
+    def _recompute_bounds(self):
+        scene = np.array([np.inf, -np.inf] * 3)
+        seen = set()
+        for name, actor in self._bounded_actors():
+            seen.add(name)
+            bounds = self._cached_actor_bounds(name, actor)
+            if bounds is None:
+                continue
+            scene[0::2] = np.minimum(scene[0::2], bounds[0::2])
+            scene[1::2] = np.maximum(scene[1::2], bounds[1::2])
+        for name in self._actor_bounds.keys() - seen:
+            del self._actor_bounds[name]
+        self._scene_bounds = scene
+
+    def _validate_bounds(self):
+        if self._scene_bounds is None:
+            return
+        for name, actor in self._bounded_actors():
+            cached = self._actor_bounds.get(name)
+            if cached is None or cached[0] != self._bounds_key(actor):
+                self._scene_bounds = None
+                return
+
+    def _expand_bounds(self, name, actor):
+        """Grow the cached scene bounds by ``actor``, return ``True`` if they changed."""
+        if self._scene_bounds is None:
+            return True
+        bounds = self._cached_actor_bounds(name, actor)
+        if bounds is None:
+            return False
+        old = self._scene_bounds.copy()
+        self._scene_bounds[0::2] = np.minimum(old[0::2], bounds[0::2])
+        self._scene_bounds[1::2] = np.maximum(old[1::2], bounds[1::2])
+        return not np.array_equal(old, self._scene_bounds)
+
+    def _shrink_bounds(self, name):
+        """Drop ``name`` from the cache, recomputing only if it touched the extremes."""
+        cached = self._actor_bounds.pop(name, None)
+        if self._scene_bounds is None:
+            return True
+        if cached is None:
+            self._scene_bounds = None
+            return True
+        bounds = cached[1]
+        if bounds is None:
+            return False
+        if np.any(bounds[0::2] <= self._scene_bounds[0::2]) or np.any(bounds[1::2] >= self._scene_bounds[1::2]):
+            self._scene_bounds = None
+            return True
+        return False
+
+    def _update_bounds_axes_cached(self):
+        self._trust_bounds_cache = True
+        try:
+            self.update_bounds_axes()
+        finally:
+            self._trust_bounds_cache = False
+
+    def enable_culling(self, min_pixels=1.0):
+        """Skip actors outside the view frustum or smaller than ``min_pixels`` on screen.
+
+        Actor bounds are kept in a :class:`BoundsTree`. Adding, removing,
+        moving or modifying the mapper or mapper input of an actor marks it dirty,
+        and :meth:`sync_actors` only updates the leaves of dirty actors.
+        Before every frame :meth:`cull` hides the actors the tree rejects,
+        :meth:`restore_culled` shows them again after it, and
+        :attr:`culled` counts them.
+        """
+        self._culling = True
+        self._cull_min_pixels = min_pixels
+        for name, actor in self._bounded_actors():
+            self._observe_bounds(name, actor)
+
+    def disable_culling(self):
+        self._culling = False
+        for name in list(self._bounds_observers):
+            self._unobserve_bounds(name)
+        self._bounds_dirty.clear()
+        self._bounds_tree = BoundsTree()
+        self.culled = 0
+
+    def _observe_bounds(self, name, actor):
+        """Mark ``name`` dirty whenever its mapper, mapper input or user transform is modified.
+
+        The actor itself is not observed, culling toggles its visibility
+        every frame. :meth:`sync_actors` checks its transform instead.
+        """
+        self._unobserve_bounds(name)
+        dirty = self._bounds_dirty
+        dirty.add(name)
+        # The callbacks only hold the dirty set, so observed objects do not keep the renderer alive
+        self._bounds_observers[name] = [(obj, obj.AddObserver('ModifiedEvent', lambda *args: dirty.add(name)))
+                                        for obj in self._bounds_sources(actor)]
+
+    @staticmethod
+    def _bounds_sources(actor):
+        mapper = actor.GetMapper() if hasattr(actor, 'GetMapper') else None
+        if mapper is None or not isinstance(actor, vtkProp3D):
+            # Nothing else to follow, its bounds are keyed on its own MTime
+            return [actor]
+        data = mapper.GetInput() if hasattr(mapper, 'GetInput') else None
+        return [obj for obj in (mapper, data, actor.GetUserMatrix(), actor.GetUserTransform()) if obj is not None]
+
+    def _unobserve_bounds(self, name):
+        self._actor_transforms.pop(name, None)
+        for obj, tag in self._bounds_observers.pop(name, ()):
+            obj.RemoveObserver(tag)
+
+    def _check_transforms(self):
+        # Only actors modified since the last frame have their transform compared
+        for name in self._bounds_observers:
+            actor = self._actors.get(name)
+            if actor is None or not isinstance(actor, vtkProp3D):
+                continue
+            mtime = actor.GetMTime()
+            seen = self._actor_transforms.get(name)
+            if seen is not None and seen[0] == mtime:
+                continue
+            transform = self._transform_key(actor)
+            if seen is None or seen[1] != transform:
+                self._bounds_dirty.add(name)
+            self._actor_transforms[name] = (mtime, transform)
+
+    def sync_actors(self):
+        """Snapshot the actors for the render thread, called from ``FboRenderer.synchronize``.
+
+        The render thread culls and probes the snapshot, so the GUI thread
+        can add and remove actors while a frame renders. With culling on,
+        the tree leaves of the actors marked dirty since are updated.
+        """
+        self._synced_actors = dict(self._actors)
+        if not self._culling:
+            return
+        self._check_transforms()
+        while self._bounds_dirty:
+            name = self._bounds_dirty.pop()
+            actor = self._actors.get(name)
+            if actor is None or not self._is_bounded(actor):
+                self._unobserve_bounds(name)
+                self._bounds_tree.remove(name)
+                continue
+            observed = [obj for obj, _ in self._bounds_observers.get(name, ())]
+            if observed != self._bounds_sources(actor):
+                # A new mapper or input, follow it instead
+                self._observe_bounds(name, actor)
+                self._bounds_dirty.discard(name)
+            self._bounds_tree.update(name, self._cached_actor_bounds(name, actor))
+
+    def cull(self):
+        """Hide the actors which would not show in the next frame, return how many.
+
+        Works on the actors and bounds of the last :meth:`sync_actors`.
+        """
+        self.culled = 0
+        if not self._culling or not self.GetDraw():
+            return 0
+        camera = self.GetActiveCamera()
+        height = max(self.GetSize()[1], 1)
+        planes = [0.0] * 24
+        camera.GetFrustumPlanes(self.GetTiledAspectRatio(), planes)
+        if camera.GetParallelProjection():
+            position, pixels_per_unit = None, height / (2 * camera.GetParallelScale())
+        else:
+            position = camera.GetPosition()
+            pixels_per_unit = height / (2 * np.tan(np.radians(camera.GetViewAngle()) / 2))
+        for name in self._bounds_tree.cull(planes, position, pixels_per_unit, self._cull_min_pixels):
+            actor = self._synced_actors.get(name)
+            if actor is not None and actor.GetVisibility():
+                actor.SetVisibility(False)
+                self._culled_actors.append((name, actor))
+        self.culled = len(self._culled_actors)
+        return self.culled
+
+    def restore_culled(self):
+        for name, actor in self._culled_actors:
+            actor.SetVisibility(True)
+        self._culled_actors = []
+
+    def enable_static_batching(self):
+        """Merge static, non-pickable polydata actors sharing a material.
+
+        Actors added with ``pickable=False`` whose material and colouring
+        match are drawn through one combined mapper. They can still be
+        removed by name, which only rebuilds the batch they belong to.
+        """
+        self._static_batching = True
+
+    def disable_static_batching(self):
+        """Stop batching and restore every batched actor individually."""
+        self._static_batching = False
+        members = []
+        for batch in self._static_batches.values():
+            members.extend(batch.members.items())
+            self.RemoveActor(batch.actor)
+            self._actors.pop(batch.name, None)
+        self._static_batches = {}
+        self._static_batch_lookup = {}
+        self._static_batch_names = {}
+        for name, actor in members:
+            self.add_actor(actor, name=name, pickable=False, render=False)
+        self.Modified()
+
+    def _add_to_static_batch(self, name, actor, key):
+        batch = self._static_batches.get(key)
+        if batch is None:
+            batch = StaticBatch(f'_static_batch-{actor.GetAddressAsString("")}', actor)
+            self._static_batches[key] = batch
+            self.AddActor(batch.actor)
+            self._actors[batch.name] = batch.actor
+        batch.add(name, actor)
+        self._static_batch_lookup[name] = key
+        self._static_batch_names[actor] = name
+
+    def _remove_from_static_batch(self, name):
+        """Take ``name`` out of its batch, returns its actor."""
+        key = self._static_batch_lookup.pop(name)
+        batch = self._static_batches[key]
+        actor = batch.remove(name)
+        if actor is not None:
+            self._static_batch_names.pop(actor, None)
+            _detach_actor(actor)
+        if len(batch) == 0:
+            self.RemoveActor(batch.actor)
+            self.parent.release_graphics_resources(batch.actor)
+            self._actors.pop(batch.name, None)
+            del self._static_batches[key]
+        return actor
 
     def add_actor(self, uinput, reset_camera=False, name=None, culling=False,
                   pickable=True, render=True):
@@ -285,19 +997,37 @@ class RendererOPENGL(Renderer):
         # Remove actor by that name if present
         rv = self.remove_actor(name, reset_camera=False, render=render)
 
-        if isinstance(uinput, vtk.vtkMapper):
-            actor = vtk.vtkActor()
+        if isinstance(uinput, vtkMapper):
+            actor = vtkActor()
             actor.SetMapper(uinput)
         else:
             actor = uinput
 
-        self.AddActor(actor)
-        actor.renderer = proxy(self)
-
         if name is None:
             name = actor.GetAddressAsString("")
 
+        if self._static_batching and not pickable:
+            key = batch_key(actor)
+            if key is not None:
+                actor.SetPickable(False)
+                actor.renderer = proxy(self)
+                self._add_to_static_batch(name, actor, key)
+                if self._expand_bounds(name, actor):
+                    self._update_bounds_axes_cached()
+                    self.ResetCameraClippingRange()
+                if render:
+                    self.Modified()
+                return actor, actor.GetProperty()
+
+        self.AddActor(actor)
+        actor.renderer = proxy(self)
+
         self._actors[name] = actor
+        texture = actor.GetTexture() if hasattr(actor, 'GetTexture') else None
+        textures = self.parent._texture_cache
+        if texture is not None and textures is not None:
+            # An actor added back takes its reference on a shared texture again
+            textures.acquire(actor, texture)
 
         if reset_camera:
             self.reset_camera(render)
@@ -306,7 +1036,11 @@ class RendererOPENGL(Renderer):
         elif render:
             self.parent.render()
 
-        self.update_bounds_axes()
+        bounds_changed = self._expand_bounds(name, actor)
+        if bounds_changed:
+            self._update_bounds_axes_cached()
+        if self._culling and self._is_bounded(actor):
+            self._observe_bounds(name, actor)
 
         if isinstance(culling, str):
             culling = culling.lower()
@@ -327,7 +1061,8 @@ class RendererOPENGL(Renderer):
 
         actor.SetPickable(pickable)
 
-        self.ResetCameraClippingRange()
+        if bounds_changed:
+            self.ResetCameraClippingRange()
         if render:
             self.Modified()
 
@@ -354,15 +1089,26 @@ class RendererOPENGL(Renderer):
             removed.
         """
         name = None
+        if isinstance(actor, vtkActor) and self._static_batch_names:
+            actor = self._static_batch_names.get(actor, actor)
         if isinstance(actor, str):
             name = actor
-            keys = list(self._actors.keys())
+            keys = list(self._actors.keys()) + list(self._static_batch_lookup.keys())
             names = []
             for k in keys:
                 if k.startswith(f'{name}-'):
                     names.append(k)
             if len(names) > 0:
                 self.remove_actor(names, reset_camera=reset_camera, render=render)
+            if name in self._static_batch_lookup:
+                actor = self._remove_from_static_batch(name)
+                registry = self.parent._scalar_bar_registry
+                if registry is not None and actor is not None:
+                    registry.remove_actor(self.parent, actor, False, render=render)
+                if self._shrink_bounds(name):
+                    self._update_bounds_axes_cached()
+                self._reset_after_removal(reset_camera, render)
+                return True
             try:
                 actor = self._actors[name]
             except KeyError:
@@ -378,16 +1124,32 @@ class RendererOPENGL(Renderer):
         if actor is None:
             return False
 
-        # First remove this actor's mapper from _scalar_bar_mappers
-        _remove_mapper_from_plotter(self.parent, actor, False, render=render)
+        # First remove this actor's mapper from the scalar bars
+        registry = self.parent._scalar_bar_registry
+        if registry is not None:
+            registry.remove_actor(self.parent, actor, False, render=render)
+        # Drop the reference on a shared texture, the actor keeps it in case it is added again
+        textures = self.parent._texture_cache
+        if textures is not None:
+            textures.release(actor)
         self.RemoveActor(actor)
+        self.parent.release_graphics_resources(actor)
+        _detach_actor(actor)
 
         if name is None:
             for k, v in self._actors.items():
                 if v == actor:
                     name = k
         self._actors.pop(name, None)
-        self.update_bounds_axes()
+        if name in self._bounds_observers:
+            self._unobserve_bounds(name)
+            self._bounds_dirty.add(name)
+        if self._shrink_bounds(name):
+            self._update_bounds_axes_cached()
+        self._reset_after_removal(reset_camera, render)
+        return True
+
+    def _reset_after_removal(self, reset_camera, render):
         if reset_camera:
             self.reset_camera()
         elif not self.camera_set and reset_camera is None:
@@ -395,7 +1157,6 @@ class RendererOPENGL(Renderer):
         elif render:
             self.parent.render()
             self.Modified()
-        return True
 
     def set_background(self, color, top=None):
         """Set the background color.
@@ -0,0 +1,171 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide2.QtCore import QObject, Signal
+from vtkmodules.vtkCommonDataModel import vtkImageData, vtkPlane, vtkPolyData
+from vtkmodules.vtkFiltersCore import vtkClipPolyData, vtkCutter
+from vtkmodules.vtkFiltersGeneral import vtkTableBasedClipDataSet
+from vtkmodules.vtkImagingCore import vtkExtractVOI
+
+_EMPTY = object()
+
+
+class LatestOnly:
+    """Run ``function`` on a single worker thread, only ever on the newest state.
+
+    States submitted while the worker is busy replace each other, so once
+    it is done it moves on to the latest one and the intermediate states
+    are dropped, counted in :attr:`dropped`. ``callback(state, result)`` is
+    called from the worker thread.
+    """
+
+    def __init__(self, function, callback, name='latest-only'):
+        self.function = function
+        self.callback = callback
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._pending = _EMPTY
+        self._busy = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+    def submit(self, state):
+        with self._lock:
+            if self._pending is not _EMPTY:
+                self.dropped += 1
+            self._pending = state
+            if self._busy:
+                return
+            self._busy = True
+        self._executor.submit(self._run)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                state, self._pending = self._pending, _EMPTY
+                if state is _EMPTY:
+                    self._busy = False
+                    return
+            self.callback(state, self.function(state))
+
+    def close(self):
+        with self._lock:
+            self._pending = _EMPTY
+        self._executor.shutdown(wait=False)
+
+
+def plane_filter(mesh, kind, normal, origin, invert=False, generate_triangles=False):
+    """Clip (``kind='clip'``) or slice (``kind='slice'``) ``mesh`` with a plane, returning a new dataset."""
+    import pyvista
+
+    plane = vtkPlane()
+    plane.SetNormal(normal)
+    plane.SetOrigin(origin)
+    if kind == 'clip':
+        alg = vtkClipPolyData() if isinstance(mesh, vtkPolyData) else vtkTableBasedClipDataSet()
+        alg.SetClipFunction(plane)
+        alg.SetValue(0.0)
+        alg.SetInsideOut(invert)
+    elif kind == 'slice':
+        alg = vtkCutter()
+        alg.SetCutFunction(plane)
+        alg.SetGenerateTriangles(generate_triangles)
+    else:
+        raise ValueError(f'Unknown plane filter {kind!r}')
+    alg.SetInputDataObject(mesh)
+    alg.Update()
+    return pyvista.wrap(alg.GetOutput())
+
+
+class AsyncPlaneFilter(QObject):
+    """Clip or slice a mesh following a plane widget, off the render thread.
+
+    The widget callback hands the newest plane to a :class:`LatestOnly`
+    worker filtering the full mesh and, for image data, to one filtering a
+    copy subsampled by ``preview_rate``. Their results are only stored;
+    :meth:`apply_pending` swaps the newest one into the output, called by
+    the plotter before each frame while the GUI thread is blocked. Results
+    of a plane that moved since are dropped and a preview never replaces
+    the full result of the same plane.
+    """
+
+    finished = Signal(object, object)
+    _ready = Signal()
+
+    def __init__(self, plotter, mesh, kind, name, normal, origin, invert=False, generate_triangles=False,
+                 preview_rate=4, parent=None):
+        super().__init__(parent)
+        self.plotter = plotter
+        self.mesh = mesh
+        self.kind = kind
+        self.name = name
+        self.invert = invert
+        self.generate_triangles = generate_triangles
+        self.preview = None
+        self.widget = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._pending = None
+        if isinstance(mesh, vtkImageData) and preview_rate > 1:
+            voi = vtkExtractVOI()
+            voi.SetInputData(mesh)
+            voi.SetVOI(mesh.GetExtent())
+            voi.SetSampleRate(preview_rate, preview_rate, preview_rate)
+            voi.Update()
+            self.preview = voi.GetOutput()
+        self._state = (tuple(normal), tuple(origin))
+        self.output = self._filter(mesh, self._state)
+        self._full_state = self._state
+        self._worker = LatestOnly(lambda state: self._filter(self.mesh, state), self._finish,
+                                  name=f'plane-filter-{name}')
+        self._preview_worker = None
+        if self.preview is not None:
+            self._preview_worker = LatestOnly(lambda state: self._filter(self.preview, state), self._previewed,
+                                              name=f'plane-preview-{name}')
+        # Queued, the workers only ask the GUI thread for another frame
+        self._ready.connect(plotter.update)
+
+    def _filter(self, mesh, state):
+        return plane_filter(mesh, self.kind, state[0], state[1], self.invert, self.generate_triangles)
+
+    def set_plane(self, normal, origin):
+        """Widget callback, safe to call from any thread."""
+        state = (tuple(normal), tuple(origin))
+        with self._lock:
+            if self._closed or state == self._state:
+                return
+            self._state = state
+        if self._preview_worker is not None:
+            self._preview_worker.submit(state)
+        self._worker.submit(state)
+
+    def _previewed(self, state, result):
+        with self._lock:
+            if self._closed or state != self._state or state == self._full_state:
+                return
+            self._pending = result
+        self._ready.emit()
+
+    def _finish(self, state, result):
+        with self._lock:
+            if self._closed or state != self._state:
+                # Superseded while it ran, the newer plane is on its way
+                return
+            self._pending = result
+            self._full_state = state
+        self.finished.emit(state, result)
+        self._ready.emit()
+
+    def apply_pending(self):
+        """Swap the newest result into :attr:`output`, from the render thread while the GUI thread is blocked."""
+        with self._lock:
+            result, self._pending = self._pending, None
+        if result is not None:
+            self.output.shallow_copy(result)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._pending = None
+        self._worker.close()
+        if self._preview_worker is not None:
+            self._preview_worker.close()
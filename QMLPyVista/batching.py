@@ -0,0 +1,134 @@
+from collections import OrderedDict
+
+from vtkmodules.vtkCommonDataModel import vtkPolyData
+from vtkmodules.vtkFiltersCore import vtkAppendPolyData
+from vtkmodules.vtkRenderingCore import vtkActor, vtkPolyDataMapper
+
+# vtkAbstractMapper scalar modes and array access modes
+_SCALAR_MODE_DEFAULT = 0
+_SCALAR_MODE_USE_POINT_DATA = 1
+_SCALAR_MODE_USE_CELL_DATA = 2
+_SCALAR_MODE_USE_POINT_FIELD_DATA = 3
+_SCALAR_MODE_USE_CELL_FIELD_DATA = 4
+_GET_ARRAY_BY_NAME = 1
+
+
+def maps_scalars(mapper):
+    """Return whether ``mapper`` colours its input by scalars, as opposed to the actor's colour.
+
+    That takes scalar visibility and an array for the scalar mode of the
+    mapper, pyvista leaves the visibility on for solid coloured meshes.
+    """
+    data = mapper.GetInput()
+    if not mapper.GetScalarVisibility() or data is None:
+        return False
+    mode = mapper.GetScalarMode()
+    point_data, cell_data = data.GetPointData(), data.GetCellData()
+    if mode == _SCALAR_MODE_DEFAULT:
+        return point_data.GetScalars() is not None or cell_data.GetScalars() is not None
+    if mode == _SCALAR_MODE_USE_POINT_DATA:
+        return point_data.GetScalars() is not None
+    if mode == _SCALAR_MODE_USE_CELL_DATA:
+        return cell_data.GetScalars() is not None
+    if mode == _SCALAR_MODE_USE_POINT_FIELD_DATA:
+        attributes = point_data
+    elif mode == _SCALAR_MODE_USE_CELL_FIELD_DATA:
+        attributes = cell_data
+    else:
+        attributes = data.GetFieldData()
+    if mapper.GetArrayAccessMode() == _GET_ARRAY_BY_NAME:
+        return attributes.GetAbstractArray(mapper.GetArrayName()) is not None
+    return attributes.GetAbstractArray(mapper.GetArrayId()) is not None
+
+
+def batch_key(actor):
+    """Return the material key of ``actor`` or ``None`` if it can not be batched.
+
+    Only plain, untransformed, untextured actors whose mapper holds static
+    ``vtkPolyData`` are batched. Two actors with the same key render
+    identically apart from their geometry, so their polydata can be merged
+    into a single mapper.
+    """
+    if not isinstance(actor, vtkActor) or actor.IsA('vtkFollower') or actor.IsA('vtkLODActor'):
+        return None
+    if not actor.GetIsIdentity() or actor.GetTexture() is not None:
+        return None
+    mapper = actor.GetMapper()
+    if mapper is None or not isinstance(mapper.GetInput(), vtkPolyData):
+        return None
+
+    prop = actor.GetProperty()
+    key = (
+        tuple(prop.GetColor()), prop.GetOpacity(),
+        prop.GetAmbient(), prop.GetDiffuse(), prop.GetSpecular(), prop.GetSpecularPower(),
+        prop.GetRepresentation(), prop.GetInterpolation(),
+        prop.GetEdgeVisibility(), tuple(prop.GetEdgeColor()),
+        prop.GetLineWidth(), prop.GetPointSize(),
+        prop.GetBackfaceCulling(), prop.GetFrontfaceCulling(),
+        prop.GetLighting(), prop.GetRenderPointsAsSpheres(), prop.GetRenderLinesAsTubes(),
+        maps_scalars(mapper),
+    )
+    if key[-1]:
+        # Scalars are mapped per batch, so the colouring setup has to match too
+        key += (
+            mapper.GetLookupTable().GetAddressAsString(''), tuple(mapper.GetScalarRange()),
+            mapper.GetScalarMode(), mapper.GetArrayName(), mapper.GetColorMode(),
+            mapper.GetInterpolateScalarsBeforeMapping(),
+        )
+    return key
+
+
+class StaticBatch:
+    """A group of static actors drawn through one combined mapper.
+
+    The original actors are kept by name so that a single member can be
+    dropped again, which only rebuilds this batch.
+    """
+
+    def __init__(self, name, template):
+        self.name = name
+        self.members = OrderedDict()
+
+        self._append = vtkAppendPolyData()
+        template_mapper = template.GetMapper()
+        self.mapper = vtkPolyDataMapper()
+        self.mapper.SetInputConnection(self._append.GetOutputPort())
+        mapped = maps_scalars(template_mapper)
+        self.mapper.SetScalarVisibility(mapped)
+        if mapped:
+            self.mapper.SetLookupTable(template_mapper.GetLookupTable())
+            self.mapper.SetScalarRange(template_mapper.GetScalarRange())
+            self.mapper.SetScalarMode(template_mapper.GetScalarMode())
+            self.mapper.SetColorMode(template_mapper.GetColorMode())
+            self.mapper.SetInterpolateScalarsBeforeMapping(template_mapper.GetInterpolateScalarsBeforeMapping())
+            if template_mapper.GetArrayName():
+                self.mapper.SelectColorArray(template_mapper.GetArrayName())
+            self.mapper.UseLookupTableScalarRangeOff()
+
+        self.actor = vtkActor()
+        self.actor.SetMapper(self.mapper)
+        self.actor.GetProperty().DeepCopy(template.GetProperty())
+        self.actor.SetPickable(False)
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, name):
+        return name in self.members
+
+    def add(self, name, actor):
+        self.members[name] = actor
+        self._append.AddInputData(actor.GetMapper().GetInput())
+        self._append.Modified()
+
+    def remove(self, name):
+        actor = self.members.pop(name, None)
+        if actor is not None:
+            self.rebuild()
+        return actor
+
+    def rebuild(self):
+        self._append.RemoveAllInputs()
+        for actor in self.members.values():
+            self._append.AddInputData(actor.GetMapper().GetInput())
+        self._append.Modified()
@@ -0,0 +1,329 @@
+import heapq
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def open_volume(source, shape=None, dtype=None, offset=0, order='C'):
+    """Memory map a volume without reading it.
+
+    ``source`` is a NumPy array, a ``.npy`` file or a raw file. Raw files
+    need their ``shape`` and ``dtype``, ``offset`` skips a header.
+    """
+    if isinstance(source, np.ndarray):
+        return source
+    if str(source).endswith('.npy'):
+        return np.load(source, mmap_mode='r')
+    if shape is None or dtype is None:
+        raise ValueError('shape and dtype are required for raw volumes')
+    return np.memmap(source, dtype=dtype, mode='r', shape=tuple(shape), offset=offset, order=order)
+
+
+class Brick:
+    """A block of a volume at one resolution level.
+
+    ``index`` is the brick position in the grid of its level, ``level`` 0
+    is full resolution and each level halves it.
+    """
+
+    __slots__ = ('level', 'index', 'origin', 'spacing', 'data')
+
+    def __init__(self, level, index, origin, spacing, data):
+        self.level = level
+        self.index = index
+        self.origin = origin
+        self.spacing = spacing
+        self.data = data
+
+    @property
+    def key(self):
+        return self.level, self.index
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def to_grid(self, name='values'):
+        """Return the brick as a ``pyvista.UniformGrid``."""
+        import pyvista
+
+        grid = pyvista.UniformGrid()
+        grid.dimensions = self.data.shape
+        grid.origin = self.origin
+        grid.spacing = self.spacing
+        grid.point_arrays[name] = self.data.ravel(order='F')
+        return grid
+
+
+class BrickedVolume:
+    """Out-of-core, multi-resolution access to a memory mapped volume.
+
+    The volume is split into bricks of ``brick_size`` samples per axis at
+    every level, coarser levels are read by striding through the memory
+    map so they never need the whole volume in memory. Bricks that were
+    read are held in an LRU cache bounded by ``cache_bytes``.
+
+    Neighbouring bricks overlap by one sample so that surfaces extracted
+    from them join up. Volumes are indexed ``[x, y, z]``.
+    """
+
+    def __init__(self, source, shape=None, dtype=None, offset=0, order='C', origin=(0.0, 0.0, 0.0),
+                 spacing=(1.0, 1.0, 1.0), brick_size=64, levels=None, cache_bytes=512 * 2 ** 20):
+        self.volume = open_volume(source, shape, dtype, offset, order)
+        if self.volume.ndim != 3:
+            raise ValueError(f'Expected a 3D volume, got shape {self.volume.shape}')
+        self.origin = np.asarray(origin, dtype=float)
+        self.spacing = np.asarray(spacing, dtype=float)
+        self.brick_size = int(brick_size)
+        if levels is None:
+            levels = max(1, int(math.ceil(math.log2(max(self.volume.shape) / self.brick_size))) + 1)
+        self.levels = levels
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def shape(self):
+        return self.volume.shape
+
+    @property
+    def bounds(self):
+        extent = self.origin + (np.array(self.shape) - 1) * self.spacing
+        return [self.origin[0], extent[0], self.origin[1], extent[1], self.origin[2], extent[2]]
+
+    def grid_shape(self, level):
+        """Return the number of bricks along each axis at ``level``."""
+        stride = 2 ** level
+        return tuple(max(1, int(math.ceil(((n - 1) // stride) / self.brick_size))) for n in self.shape)
+
+    def brick_bounds(self, level, index):
+        step = self.brick_size * 2 ** level
+        lower = self.origin + np.array(index) * step * self.spacing
+        upper = np.minimum(lower + step * self.spacing, self.bounds[1::2])
+        return lower, upper
+
+    def brick(self, level, index):
+        """Return the brick at ``level``/``index``, reading it on a cache miss."""
+        key = (level, tuple(index))
+        try:
+            brick = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            brick = self._read(level, key[1])
+            self._cache[key] = brick
+            self._cached_bytes += brick.nbytes
+            self._evict()
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        return brick
+
+    def _read(self, level, index):
+        stride = 2 ** level
+        slices = []
+        for i, n in zip(index, self.shape):
+            start = i * self.brick_size * stride
+            # One extra sample overlaps with the next brick
+            stop = min(start + self.brick_size * stride + 1, n)
+            slices.append(slice(start, stop, stride))
+        data = np.ascontiguousarray(self.volume[tuple(slices)])
+        origin = self.origin + np.array([s.start for s in slices]) * self.spacing
+        return Brick(level, index, tuple(origin), tuple(self.spacing * stride), data)
+
+    def _evict(self):
+        while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+            _, brick = self._cache.popitem(last=False)
+            self._cached_bytes -= brick.nbytes
+
+    def select(self, camera_position, plane=None, invert=False, max_bricks=64, detail=1.0):
+        """Choose the bricks needed to display the volume from ``camera_position``.
+
+        Starting from the coarsest level, the brick covering the largest
+        screen area (its size over its distance to the camera) is split
+        into the bricks of the next level, as long as the selection stays
+        within ``max_bricks``. Bricks stop refining once their size times
+        ``detail`` is under their distance, so that every brick covers
+        about the same screen area, and the selection always covers the
+        whole volume. Bricks entirely on the clipped side of ``plane``
+        (``(normal, origin)``) are skipped, the side the normal points to
+        is kept unless ``invert`` is set, matching ``add_mesh_clip_plane``.
+        The nearest bricks come first.
+        """
+        camera_position = np.asarray(camera_position, dtype=float)
+
+        def entry(level, index):
+            lower, upper = self.brick_bounds(level, index)
+            if plane is not None and not self._intersects_half_space(lower, upper, plane, invert):
+                return None
+            distance = max(np.linalg.norm(np.clip(camera_position, lower, upper) - camera_position), 1e-12)
+            error = np.linalg.norm(upper - lower) * detail / distance
+            return -error, distance, level, index
+
+        heap = [e for e in (entry(self.levels - 1, index) for index in np.ndindex(self.grid_shape(self.levels - 1)))
+                if e is not None]
+        heapq.heapify(heap)
+        selected = []
+        while heap:
+            error, distance, level, index = heapq.heappop(heap)
+            if -error <= 1.0:
+                # Every other brick is fine enough as well
+                selected.append((distance, level, index))
+                selected.extend(e[1:] for e in heap)
+                break
+            children = []
+            if level > 0:
+                child_grid = self.grid_shape(level - 1)
+                for offset in np.ndindex(2, 2, 2):
+                    child = tuple(2 * i + o for i, o in zip(index, offset))
+                    if all(c < n for c, n in zip(child, child_grid)):
+                        children.append(entry(level - 1, child))
+                children = [child for child in children if child is not None]
+            if level == 0 or len(selected) + len(heap) + len(children) > max_bricks:
+                selected.append((distance, level, index))
+                continue
+            for child in children:
+                heapq.heappush(heap, child)
+        selected.sort()
+        return [(level, index) for _, level, index in selected]
+
+    @staticmethod
+    def _intersects_half_space(lower, upper, plane, invert=False):
+        normal, origin = (np.asarray(v, dtype=float) for v in plane)
+        corners = np.array([[(lower, upper)[k][axis] for axis, k in enumerate(c)] for c in np.ndindex(2, 2, 2)])
+        side = (corners - origin) @ normal
+        return np.any(side <= 0) if invert else np.any(side >= 0)
+
+
+class BrickedVolumeView:
+    """Display a :class:`BrickedVolume` in a plotter, streaming bricks as the view changes.
+
+    Each brick is added as its own mesh named ``{name}-{level}-{i}-{j}-{k}``
+    so the whole volume can be removed with ``remove_actor(name)``. Only
+    bricks that entered or left the selection are added or removed. Without
+    a ``clim`` the color range is estimated from a random sample of the
+    volume, pass it when the exact range is known.
+
+    :meth:`update` and :meth:`set_plane` may be called from any thread,
+    they only hand the camera and plane to a :class:`LatestOnly` worker
+    which selects, reads and clips the bricks. The result is kept until
+    :meth:`apply_pending` swaps the actors, called by the plotter before
+    each frame, and ``ready`` is called from the worker to ask for it.
+    """
+
+    def __init__(self, plotter, volume, name, plane=None, invert=False, max_bricks=64, detail=1.0, ready=None,
+                 **kwargs):
+        from QMLPyVista.async_filters import LatestOnly
+
+        self.plotter = plotter
+        self.volume = volume
+        self.name = name
+        self.plane = plane
+        self.invert = invert
+        self.max_bricks = max_bricks
+        self.detail = detail
+        self.kwargs = kwargs
+        if kwargs.get('clim') is None:
+            self.kwargs['clim'] = self._sampled_range()
+        self._ready = ready if ready is not None else plotter.update
+        self._lock = threading.Lock()
+        self._shown = {}
+        self._pending = None
+        self._force = False
+        self._loaded_keys = set()
+        self._worker = LatestOnly(self._load, self._loaded, name=f'bricks-{name}')
+
+    def _sampled_range(self, samples=65536, seed=0):
+        """Estimate the value range from ``samples`` random voxels, without reading the whole volume."""
+        volume = self.volume.volume
+        if volume.size <= samples:
+            return [float(np.nanmin(volume)), float(np.nanmax(volume))]
+        flat = np.sort(np.random.default_rng(seed).choice(volume.size, samples, replace=False))
+        values = volume[np.unravel_index(flat, volume.shape)]
+        return [float(np.nanmin(values)), float(np.nanmax(values))]
+
+    def _actor_name(self, key):
+        level, index = key
+        return '-'.join([self.name, str(level)] + [str(i) for i in index])
+
+    def set_plane(self, normal, origin):
+        """Plane widget callback, safe to call from any thread."""
+        self.plane = (tuple(normal), tuple(origin))
+        self.update(force=True)
+
+    def update(self, force=False):
+        """Stream in the bricks the current camera and clip plane need."""
+        with self._lock:
+            worker = self._worker
+            # Kept until a load picks it up, the worker may drop this state
+            self._force = self._force or force
+        if worker is not None:
+            worker.submit((self.plotter.renderer.GetActiveCamera().GetPosition(), self.plane))
+
+    def _load(self, state):
+        # Runs on the worker, the only thread reading from the volume
+        camera, plane = state
+        with self._lock:
+            force, self._force = self._force, False
+        if force:
+            self._loaded_keys = set()
+        wanted = [(level, tuple(index)) for level, index in
+                  self.volume.select(camera, plane, self.invert, self.max_bricks, self.detail)]
+        grids = {}
+        for key in wanted:
+            if key in self._loaded_keys:
+                continue
+            grid = self.volume.brick(*key).to_grid()
+            if plane is not None:
+                grid = grid.clip(normal=plane[0], origin=plane[1], invert=self.invert)
+            grids[key] = grid if grid.n_points else None
+        self._loaded_keys = set(wanted)
+        return wanted, grids, force
+
+    def _loaded(self, state, result):
+        wanted, grids, force = result
+        with self._lock:
+            if self._worker is None:
+                return
+            if self._pending is not None and not force:
+                # Not applied yet, keep the bricks it loaded
+                _, pending_grids, force = self._pending
+                grids = {**pending_grids, **grids}
+            self._pending = wanted, grids, force
+        self._ready()
+
+    def apply_pending(self):
+        """Swap in the newest selection, from the render thread while the GUI thread is blocked."""
+        with self._lock:
+            result, self._pending = self._pending, None
+        if result is None:
+            return
+        wanted, grids, force = result
+        if force:
+            self.clear()
+        for key in set(self._shown) - set(wanted):
+            self.plotter.remove_actor(self._shown.pop(key), reset_camera=False, render=False)
+        for key in wanted:
+            grid = grids.get(key)
+            if grid is None or key in self._shown:
+                continue
+            name = self._actor_name(key)
+            self.plotter.add_mesh(grid, name=name, reset_camera=False, render=False, **self.kwargs)
+            self._shown[key] = name
+
+    def clear(self):
+        for name in self._shown.values():
+            self.plotter.remove_actor(name, reset_camera=False, render=False)
+        self._shown = {}
+
+    def close(self):
+        """Stop streaming and remove the bricks."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+            self._pending = None
+        if worker is not None:
+            worker.close()
+        self.clear()
@@ -0,0 +1,156 @@
+import numpy as np
+
+
+class _Node:
+    __slots__ = ('lower', 'upper', 'name', 'parent', 'left', 'right')
+
+    def __init__(self, lower, upper, name=None):
+        self.lower = lower
+        self.upper = upper
+        self.name = name
+        self.parent = None
+        self.left = None
+        self.right = None
+
+
+def _area(lower, upper):
+    d = upper - lower
+    return 2.0 * (d[0] * d[1] + d[1] * d[2] + d[2] * d[0])
+
+
+class BoundsTree:
+    """Dynamic bounding volume hierarchy over named axis-aligned bounds.
+
+    Leaves are inserted next to the leaf whose enclosing boxes grow the
+    least in surface area, and removed by promoting their sibling, so
+    adding or removing an actor only touches one path of the tree.
+    """
+
+    def __init__(self):
+        self._root = None
+        self._leaves = {}
+
+    def __len__(self):
+        return len(self._leaves)
+
+    def __contains__(self, name):
+        return name in self._leaves
+
+    def update(self, name, bounds):
+        """Insert or move ``name`` to the VTK style ``bounds``, ``None`` removes it."""
+        if bounds is None:
+            return self.remove(name)
+        bounds = np.asarray(bounds, dtype=float)
+        lower, upper = bounds[0::2], bounds[1::2]
+        if np.any(lower > upper):
+            # Empty actors have uninitialised bounds
+            return self.remove(name)
+        leaf = self._leaves.get(name)
+        if leaf is not None:
+            if np.array_equal(leaf.lower, lower) and np.array_equal(leaf.upper, upper):
+                return
+            self.remove(name)
+        self._insert(_Node(lower, upper, name))
+
+    def _insert(self, leaf):
+        self._leaves[leaf.name] = leaf
+        if self._root is None:
+            self._root = leaf
+            return
+        node = self._root
+        while node.name is None:
+            costs = []
+            for child in (node.left, node.right):
+                grown = _area(np.minimum(child.lower, leaf.lower), np.maximum(child.upper, leaf.upper))
+                costs.append(grown - _area(child.lower, child.upper))
+            node = node.left if costs[0] <= costs[1] else node.right
+        parent = _Node(np.minimum(node.lower, leaf.lower), np.maximum(node.upper, leaf.upper))
+        grand = node.parent
+        parent.parent = grand
+        parent.left, parent.right = node, leaf
+        node.parent = leaf.parent = parent
+        if grand is None:
+            self._root = parent
+        else:
+            if grand.left is node:
+                grand.left = parent
+            else:
+                grand.right = parent
+            self._refit(grand)
+
+    def remove(self, name):
+        leaf = self._leaves.pop(name, None)
+        if leaf is None:
+            return
+        parent = leaf.parent
+        if parent is None:
+            self._root = None
+            return
+        sibling = parent.left if parent.right is leaf else parent.right
+        grand = parent.parent
+        sibling.parent = grand
+        if grand is None:
+            self._root = sibling
+            return
+        if grand.left is parent:
+            grand.left = sibling
+        else:
+            grand.right = sibling
+        self._refit(grand)
+
+    @staticmethod
+    def _refit(node):
+        while node is not None:
+            node.lower = np.minimum(node.left.lower, node.right.lower)
+            node.upper = np.maximum(node.left.upper, node.right.upper)
+            node = node.parent
+
+    @staticmethod
+    def _names(node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.name is not None:
+                yield node.name
+            else:
+                stack.extend((node.left, node.right))
+
+    def cull(self, planes, camera_position=None, pixels_per_unit=None, min_pixels=0.0):
+        """Return the names outside the frustum ``planes`` or smaller than ``min_pixels`` on screen.
+
+        ``planes`` are ``(6, 4)`` coefficients facing inwards, as
+        ``vtkCamera.GetFrustumPlanes`` returns. The projected size is the
+        box diagonal times ``pixels_per_unit``, divided by the distance
+        from ``camera_position`` unless it is ``None`` (parallel
+        projection). Whole subtrees are culled or accepted at once, nodes
+        entirely inside the frustum skip the plane tests below them.
+        """
+        if self._root is None:
+            return []
+        planes = np.asarray(planes, dtype=float).reshape(-1, 4)
+        normals, offsets = planes[:, :3], planes[:, 3]
+        positive = normals >= 0
+        position = None if camera_position is None else np.asarray(camera_position, dtype=float)
+        culled = []
+        stack = [(self._root, True)]
+        while stack:
+            node, test = stack.pop()
+            if test:
+                # Outside if the corner furthest along a plane normal is behind it
+                if np.any(np.einsum('ij,ij->i', normals, np.where(positive, node.upper, node.lower)) + offsets < 0):
+                    culled.extend(self._names(node))
+                    continue
+                # Inside if the nearest corner is in front of every plane
+                test = np.any(np.einsum('ij,ij->i', normals, np.where(positive, node.lower, node.upper)) + offsets < 0)
+            if min_pixels > 0 and pixels_per_unit:
+                size = np.linalg.norm(node.upper - node.lower) * pixels_per_unit
+                if position is not None:
+                    distance = np.linalg.norm(np.clip(position, node.lower, node.upper) - position)
+                    size = np.inf if distance == 0 else size / distance
+                if size < min_pixels:
+                    culled.extend(self._names(node))
+                    continue
+            if node.name is None:
+                stack.append((node.left, test))
+                stack.append((node.right, test))
+        return culled
@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from vtkmodules.util.numpy_support import ID_TYPE_CODE, numpy_to_vtk, numpy_to_vtkIdTypeArray, vtk_to_numpy
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonDataModel import (vtkCellArray, vtkImageData, vtkPolyData, vtkStructuredGrid,
+                                           vtkUnstructuredGrid)
+
+_POLY_CELLS = ('verts', 'lines', 'polys', 'strips')
+_FORMAT = 1
+# Cells are stored as offsets and connectivity, vtkCellArray's layout since
+# VTK 9. Older versions hold (count, ids...) records and need a conversion.
+_OFFSETS_LAYOUT = hasattr(vtkCellArray, 'GetOffsetsArray')
+
+
+def default_cache_dir():
+    return os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+                        'QMLPyVista', 'datasets')
+
+
+def source_identity(source):
+    """Return a JSON-able identity for ``source``.
+
+    Files are identified by their path, size and modification time so
+    that editing them invalidates the cache, callables by their qualified
+    name and anything else by its ``repr``.
+    """
+    if isinstance(source, (str, os.PathLike)) and os.path.isfile(source):
+        stat = os.stat(source)
+        return ['file', os.path.abspath(source), stat.st_size, stat.st_mtime_ns]
+    if callable(source):
+        return ['callable', getattr(source, '__module__', ''), getattr(source, '__qualname__', repr(source))]
+    if isinstance(source, (list, tuple)):
+        return [source_identity(s) for s in source]
+    return ['value', repr(source)]
+
+
+class DatasetCache:
+    """On-disk cache of meshes and derived datasets.
+
+    Every entry is a directory of ``.npy`` files, one per points, cell and
+    data array, plus a small JSON header. Entries are loaded through
+    memory maps and handed to VTK without copying, so reopening even very
+    large meshes only costs the page faults of the data that is drawn.
+
+    Entries are keyed by the identity of their source and the parameters
+    of the filters applied to it::
+
+        cache = DatasetCache()
+        mesh = cache.fetch(examples.download_cow)
+        decimated = cache.fetch(examples.download_cow, lambda: mesh.decimate_boundary(0.75),
+                                filter='decimate_boundary', target_reduction=0.75)
+    """
+
+    def __init__(self, root=None):
+        self.root = root or default_cache_dir()
+        os.makedirs(self.root, exist_ok=True)
+
+    def key(self, source, **params) -> str:
+        identity = json.dumps({'source': source_identity(source), 'params': params, 'format': _FORMAT},
+                              sort_keys=True, default=repr)
+        return hashlib.sha1(identity.encode()).hexdigest()
+
+    def path(self, key) -> str:
+        return os.path.join(self.root, key)
+
+    def __contains__(self, key):
+        return os.path.isfile(os.path.join(self.path(key), 'header.json'))
+
+    def fetch(self, source, loader=None, **params):
+        """Return the dataset for ``source`` and ``params``, producing it on a miss.
+
+        ``loader`` builds the dataset when it is not cached yet. It
+        defaults to calling ``source`` if it is callable, or reading it
+        with ``pyvista.read`` otherwise.
+        """
+        key = self.key(source, **params)
+        if key not in self:
+            if loader is None:
+                loader = source if callable(source) else _reader(source)
+            self.store(key, loader())
+        return self.load(key)
+
+    def invalidate(self, source, **params):
+        shutil.rmtree(self.path(self.key(source, **params)), ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+
+    def store(self, key, dataset):
+        """Write ``dataset`` under ``key``, replacing any existing entry atomically."""
+        tmp = tempfile.mkdtemp(dir=self.root, prefix='.tmp-')
+        try:
+            header = _write_dataset(tmp, dataset)
+            with open(os.path.join(tmp, 'header.json'), 'w') as f:
+                json.dump(header, f)
+            shutil.rmtree(self.path(key), ignore_errors=True)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def load(self, key):
+        """Map the entry ``key`` back into a dataset without copying its arrays."""
+        import pyvista
+
+        path = self.path(key)
+        with open(os.path.join(path, 'header.json')) as f:
+            header = json.load(f)
+
+        def array(name):
+            # Copy-on-write maps, VTK needs writable buffers to wrap
+            return np.load(os.path.join(path, name + '.npy'), mmap_mode='c')
+
+        kind = header['type']
+        if kind == 'vtkImageData':
+            dataset = vtkImageData()
+            dataset.SetDimensions(header['dimensions'])
+            dataset.SetOrigin(header['origin'])
+            dataset.SetSpacing(header['spacing'])
+        else:
+            dataset = {'vtkPolyData': vtkPolyData, 'vtkStructuredGrid': vtkStructuredGrid,
+                       'vtkUnstructuredGrid': vtkUnstructuredGrid}[kind]()
+            points = vtkPoints()
+            points.SetData(numpy_to_vtk(array('points'), deep=False))
+            dataset.SetPoints(points)
+        if kind == 'vtkPolyData':
+            for cells in _POLY_CELLS:
+                if cells in header['cells']:
+                    getattr(dataset, 'Set' + cells.capitalize())(_cell_array(array, cells))
+        elif kind == 'vtkUnstructuredGrid':
+            types = numpy_to_vtk(array('celltypes'), deep=False)
+            if _OFFSETS_LAYOUT:
+                dataset.SetCells(types, _cell_array(array, 'cells'))
+            else:
+                offsets = array('cells-offsets')
+                locations = offsets[:-1] + np.arange(len(offsets) - 1, dtype=offsets.dtype)
+                dataset.SetCells(types, numpy_to_vtkIdTypeArray(locations, deep=True), _cell_array(array, 'cells'))
+        elif kind == 'vtkStructuredGrid':
+            dataset.SetDimensions(header['dimensions'])
+
+        for association, attributes in (('point', dataset.GetPointData()), ('cell', dataset.GetCellData())):
+            for i, name in enumerate(header[association]['arrays']):
+                vtk_array = numpy_to_vtk(array(f'{association}-{i}'), deep=False)
+                vtk_array.SetName(name)
+                attributes.AddArray(vtk_array)
+            if header[association]['scalars'] is not None:
+                attributes.SetActiveScalars(header[association]['scalars'])
+        return pyvista.wrap(dataset)
+
+
+def _reader(source):
+    def read():
+        import pyvista
+        return pyvista.read(source)
+    return read
+
+
+def _cell_array(array, name):
+    offsets, connectivity = array(name + '-offsets'), array(name + '-connectivity')
+    cells = vtkCellArray()
+    if _OFFSETS_LAYOUT:
+        cells.SetData(numpy_to_vtkIdTypeArray(offsets, deep=False),
+                      numpy_to_vtkIdTypeArray(connectivity, deep=False))
+        # SetData shallow copies into arrays of the storage type, the
+        # wrappers passed in die with their reference to the memory maps.
+        # Hand the maps to the stored arrays, VTK keeps the attributes of
+        # an array alive for as long as the array itself.
+        cells.GetOffsetsArray()._numpy_reference = offsets
+        cells.GetConnectivityArray()._numpy_reference = connectivity
+        return cells
+    # Interleave the counts with the ids, copying
+    counts = np.diff(offsets)
+    starts = offsets[:-1] + np.arange(len(counts), dtype=offsets.dtype)
+    legacy = np.empty(len(counts) + len(connectivity), dtype=ID_TYPE_CODE)
+    is_id = np.ones(len(legacy), dtype=bool)
+    is_id[starts] = False
+    legacy[starts] = counts
+    legacy[is_id] = connectivity
+    cells.SetCells(len(counts), numpy_to_vtkIdTypeArray(legacy, deep=True))
+    return cells
+
+
+def _cell_layout(cells):
+    """Return the offsets and connectivity arrays of ``cells``."""
+    if _OFFSETS_LAYOUT:
+        return vtk_to_numpy(cells.GetOffsetsArray()), vtk_to_numpy(cells.GetConnectivityArray())
+    legacy = vtk_to_numpy(cells.GetData())
+    starts = _record_starts(legacy, cells.GetNumberOfCells())
+    counts = legacy[starts]
+    is_id = np.ones(len(legacy), dtype=bool)
+    is_id[starts] = False
+    return np.concatenate([[0], np.cumsum(counts)]), legacy[is_id]
+
+
+def _record_starts(legacy, n_cells):
+    """Return the positions of the ``n_cells`` count entries of a legacy ``(count, ids...)`` array.
+
+    The starts are the orbit of 0 under ``i -> i + legacy[i] + 1``, found
+    by pointer doubling: every pass applies the jumps found so far to the
+    starts found so far, doubling both, so it takes ``log2(n_cells)``
+    vectorized passes instead of one Python step per cell.
+    """
+    size = len(legacy)
+    if n_cells == 0:
+        return np.empty(0, dtype=np.int64)
+    # Entries past the end, including those read from ids, land on a sentinel
+    jump = np.minimum(np.arange(size, dtype=np.int64) + legacy.astype(np.int64) + 1, size)
+    jump = np.append(jump, size)
+    starts = np.zeros(1, dtype=np.int64)
+    while len(starts) < n_cells:
+        found = np.union1d(starts, jump[starts])
+        found = found[found < size]
+        if len(found) == len(starts):
+            raise ValueError(f'Legacy cell array holds {len(starts)} cells, expected {n_cells}')
+        starts = found
+        jump = jump[jump]
+    return starts[:n_cells]
+
+
+def _save_cells(path, name, cells):
+    # Stored as vtkIdType so that loading can wrap them without conversion
+    offsets, connectivity = _cell_layout(cells)
+    np.save(os.path.join(path, name + '-offsets.npy'), offsets.astype(ID_TYPE_CODE))
+    np.save(os.path.join(path, name + '-connectivity.npy'), connectivity.astype(ID_TYPE_CODE))
+
+
+def _write_dataset(path, dataset):
+    header = {'type': dataset.GetClassName()}
+    if isinstance(dataset, vtkImageData):
+        header['type'] = 'vtkImageData'
+        header.update(dimensions=dataset.GetDimensions(), origin=dataset.GetOrigin(), spacing=dataset.GetSpacing())
+    elif isinstance(dataset, (vtkPolyData, vtkStructuredGrid, vtkUnstructuredGrid)):
+        for kind in ('vtkPolyData', 'vtkStructuredGrid', 'vtkUnstructuredGrid'):
+            if dataset.IsA(kind):
+                header['type'] = kind
+        np.save(os.path.join(path, 'points.npy'), vtk_to_numpy(dataset.GetPoints().GetData()))
+    else:
+        raise TypeError(f'Can not cache datasets of type {dataset.GetClassName()}')
+
+    if header['type'] == 'vtkPolyData':
+        header['cells'] = []
+        for name in _POLY_CELLS:
+            cells = getattr(dataset, 'Get' + name.capitalize())()
+            if cells is not None and cells.GetNumberOfCells() > 0:
+                _save_cells(path, name, cells)
+                header['cells'].append(name)
+    elif header['type'] == 'vtkUnstructuredGrid':
+        _save_cells(path, 'cells', dataset.GetCells())
+        np.save(os.path.join(path, 'celltypes.npy'), vtk_to_numpy(dataset.GetCellTypesArray()))
+    elif header['type'] == 'vtkStructuredGrid':
+        header['dimensions'] = dataset.GetDimensions()
+
+    for association, attributes in (('point', dataset.GetPointData()), ('cell', dataset.GetCellData())):
+        names = []
+        for i in range(attributes.GetNumberOfArrays()):
+            vtk_array = attributes.GetArray(i)
+            if vtk_array is None:
+                # String and other abstract arrays can not be mapped
+                continue
+            np.save(os.path.join(path, f'{association}-{len(names)}.npy'), vtk_to_numpy(vtk_array))
+            names.append(vtk_array.GetName() or f'{association}-{i}')
+        scalars = attributes.GetScalars()
+        header[association] = {'arrays': names, 'scalars': scalars.GetName() if scalars is not None else None}
+    return header
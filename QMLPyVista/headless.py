@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+
+from PySide2.QtCore import QCoreApplication, QEventLoop, Qt, QTimer
+from PySide2.QtGui import QGuiApplication, QSurfaceFormat
+
+_QML = b'''
+import QtQuick 2.12
+import QtQuick.Window 2.12
+import QtVTK 1.0
+
+Window {
+    width: %d
+    height: %d
+    visible: true
+
+    VtkFboItem {
+        objectName: "vtkFboItem"
+        anchors.fill: parent
+    }
+}
+'''
+
+
+def use_offscreen_platform(software_gl=True):
+    """Select Qt's offscreen platform, must be called before the application is created."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    if software_gl:
+        os.environ.setdefault('LIBGL_ALWAYS_SOFTWARE', '1')
+        QCoreApplication.setAttribute(Qt.AA_UseSoftwareOpenGL)
+
+
+def default_format():
+    fmt = QSurfaceFormat()
+    fmt.setRenderableType(QSurfaceFormat.OpenGL)
+    fmt.setVersion(3, 2)
+    fmt.setProfile(QSurfaceFormat.CoreProfile)
+    fmt.setSwapBehavior(QSurfaceFormat.DoubleBuffer)
+    fmt.setDepthBufferSize(8)
+    fmt.setAlphaBufferSize(8)
+    fmt.setStencilBufferSize(0)
+    fmt.setSamples(0)
+    return fmt
+
+
+class HeadlessSession:
+    """A window holding a single ``FboItem``, for scripts and servers without a display."""
+
+    def __init__(self, size=(640, 480), offscreen=True, software_gl=True):
+        if offscreen:
+            use_offscreen_platform(software_gl)
+        QSurfaceFormat.setDefaultFormat(default_format())
+        self.app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+
+        from PySide2.QtQml import QQmlApplicationEngine, qmlRegisterType
+        from QMLPyVista.QVTKFrameBufferObjectItem import FboItem
+
+        qmlRegisterType(FboItem, 'QtVTK', 1, 0, 'VtkFboItem')
+        self.engine = QQmlApplicationEngine()
+        self.engine.loadData(_QML % (size[0], size[1]))
+        self.window = self.engine.rootObjects()[0]
+        self.item = self.window.findChild(FboItem, 'vtkFboItem')
+
+    def wait_for_frame(self, timeout=10.0) -> float:
+        """Request a frame and block until it is swapped, return the time taken in seconds.
+
+        Raises ``TimeoutError`` when no frame was swapped within ``timeout`` seconds.
+        """
+        loop = QEventLoop()
+        swapped = []
+
+        def on_swapped():
+            swapped.append(time.perf_counter())
+            loop.quit()
+
+        self.window.frameSwapped.connect(on_swapped)
+        QTimer.singleShot(int(timeout * 1000), loop.quit)
+        start = time.perf_counter()
+        self.item.update()
+        loop.exec_()
+        self.window.frameSwapped.disconnect(on_swapped)
+        if not swapped:
+            raise TimeoutError(f'No frame was swapped within {timeout}s')
+        return swapped[0] - start
+
+    def process_events(self):
+        self.app.processEvents()
@@ -0,0 +1,118 @@
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+from vtkmodules.vtkCommonCore import vtkLookupTable
+from pyvista import parse_color, rcParams
+from pyvista.plotting.colors import get_cmap_safe
+from vtkmodules.util.numpy_support import numpy_to_vtk
+
+
+class LookupTableCache:
+    """Bounded LRU cache of colormaps and ``vtkLookupTable`` objects.
+
+    Tables are keyed by colormap name, number of colors, scalar range, log
+    scaling and the out-of-range/NaN options, so actors and scalar bars asking for the
+    same mapping share a single table. Ask for ``private=True`` to get a
+    copy that can be modified freely. Shared tables must not be modified,
+    :meth:`with_range` swaps them for the table of another range instead.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._tables = OrderedDict()
+        self._colormaps = OrderedDict()
+        # Outlives eviction, tables still in use keep their key
+        self._shared = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._tables)
+
+    def clear(self):
+        self._tables.clear()
+        self._colormaps.clear()
+
+    @staticmethod
+    def key(cmap, n_colors=256, clim=None, flip=False, nan_color=None, below_color=None, above_color=None,
+            nan_opacity=1.0, log_scale=False):
+        def color(value):
+            return None if value is None else tuple(parse_color(value))
+        # Same default as ``add_mesh``, so shared tables match pyvista's
+        if nan_color is None:
+            nan_color = rcParams['nan_color']
+        return (cmap, int(n_colors), None if clim is None else (float(clim[0]), float(clim[1])), bool(flip),
+                color(nan_color), color(below_color), color(above_color), float(nan_opacity), bool(log_scale))
+
+    def colormap(self, cmap):
+        """Return the colormap object for ``cmap``, resolving each name once."""
+        if not isinstance(cmap, str):
+            return get_cmap_safe(cmap)
+        try:
+            self._colormaps.move_to_end(cmap)
+            return self._colormaps[cmap]
+        except KeyError:
+            pass
+        colormap = get_cmap_safe(cmap)
+        self._colormaps[cmap] = colormap
+        self._evict(self._colormaps)
+        return colormap
+
+    def get(self, cmap, n_colors=256, clim=None, flip=False, nan_color=None, below_color=None, above_color=None,
+            nan_opacity=1.0, log_scale=False, private=False):
+        """Return a lookup table for ``cmap``, building it on a cache miss."""
+        key = self.key(cmap, n_colors, clim, flip, nan_color, below_color, above_color, nan_opacity, log_scale)
+        table = self._tables.get(key)
+        if table is None:
+            self.misses += 1
+            table = self._build(key)
+            self._tables[key] = table
+            self._shared[table] = key
+            self._evict(self._tables)
+        else:
+            self.hits += 1
+            self._tables.move_to_end(key)
+        if private:
+            copy = vtkLookupTable()
+            copy.DeepCopy(table)
+            return copy
+        return table
+
+    def with_range(self, table, clim):
+        """Return ``table`` for the scalar range ``clim``.
+
+        Shared tables are left untouched and the cached table with the same
+        colormap and options for ``clim`` is returned, other tables have
+        their range set in place.
+        """
+        key = self._shared.get(table)
+        if key is None:
+            table.SetRange(*clim)
+            return table
+        return self.get(key[0], key[1], clim, *key[3:])
+
+    def _build(self, key):
+        cmap, n_colors, clim, flip, nan_color, below_color, above_color, nan_opacity, log_scale = key
+        ctable = (self.colormap(cmap)(np.linspace(0, 1, n_colors)) * 255).astype(np.uint8)
+        if flip:
+            ctable = np.ascontiguousarray(ctable[::-1])
+        table = vtkLookupTable()
+        table.SetNumberOfTableValues(n_colors)
+        table.SetTable(numpy_to_vtk(ctable))
+        if log_scale:
+            table.SetScaleToLog10()
+        if clim is not None:
+            table.SetRange(*clim)
+        table.SetNanColor(*nan_color, nan_opacity)
+        if below_color is not None:
+            table.SetBelowRangeColor(*below_color, 1.0)
+            table.UseBelowRangeColorOn()
+        if above_color is not None:
+            table.SetAboveRangeColor(*above_color, 1.0)
+            table.UseAboveRangeColorOn()
+        return table
+
+    def _evict(self, cache):
+        while len(cache) > self.maxsize:
+            cache.popitem(last=False)
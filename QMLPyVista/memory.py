@@ -0,0 +1,113 @@
+from vtkmodules.vtkCommonDataModel import vtkDataSet, vtkPolyData
+from vtkmodules.vtkRenderingCore import vtkActor, vtkVolume
+
+# Bytes uploaded per point for each attribute. VTK converts point
+# coordinates and normals to float32 on upload and maps scalars to RGBA.
+_POSITION_BYTES = 12
+_NORMAL_BYTES = 12
+_TCOORD_BYTES = 8
+_COLOR_BYTES = 4
+_INDEX_BYTES = 4
+
+
+def dataset_cpu_bytes(dataset) -> int:
+    """Return the memory held by ``dataset`` on the CPU side, in bytes."""
+    if dataset is None:
+        return 0
+    return dataset.GetActualMemorySize() * 1024
+
+
+def _cell_index_count(polydata) -> int:
+    count = 0
+    for cells in (polydata.GetVerts(), polydata.GetLines(), polydata.GetPolys(), polydata.GetStrips()):
+        if cells is not None:
+            count += cells.GetNumberOfConnectivityIds()
+    return count
+
+
+def texture_gpu_bytes(texture) -> int:
+    if texture is None or texture.GetInput() is None:
+        return 0
+    dims = texture.GetInput().GetDimensions()
+    nbytes = dims[0] * dims[1] * dims[2] * 4
+    if hasattr(texture, 'GetMipmap') and texture.GetMipmap():
+        nbytes = nbytes * 4 // 3
+    return nbytes
+
+
+def dataset_gpu_bytes(dataset, scalar_visibility=True, edges=False) -> int:
+    """Estimate the buffer memory needed to draw ``dataset``, in bytes."""
+    if dataset is None or not isinstance(dataset, vtkDataSet):
+        return 0
+    n_points = dataset.GetNumberOfPoints()
+    point_data = dataset.GetPointData()
+    per_point = _POSITION_BYTES
+    if point_data.GetNormals() is not None:
+        per_point += _NORMAL_BYTES
+    if point_data.GetTCoords() is not None:
+        per_point += _TCOORD_BYTES
+    if scalar_visibility and (point_data.GetScalars() is not None or dataset.GetCellData().GetScalars() is not None):
+        per_point += _COLOR_BYTES
+    if isinstance(dataset, vtkPolyData):
+        indices = _cell_index_count(dataset)
+    else:
+        # Other datasets are drawn through their extracted surface, use the
+        # cell count as a rough stand-in for its size
+        indices = dataset.GetNumberOfCells() * 4
+    if edges:
+        indices *= 2
+    return n_points * per_point + indices * _INDEX_BYTES
+
+
+def prop_memory(prop, seen=None) -> dict:
+    """Estimate the CPU and GPU bytes held by a prop.
+
+    ``seen`` collects the datasets already accounted for so that data
+    shared between several props is only counted once.
+    """
+    if seen is None:
+        seen = set()
+    cpu = gpu = 0
+    if isinstance(prop, vtkActor):
+        mapper = prop.GetMapper()
+        dataset = mapper.GetInput() if mapper is not None else None
+        if dataset is not None:
+            key = dataset.GetAddressAsString('')
+            if key not in seen:
+                seen.add(key)
+                cpu += dataset_cpu_bytes(dataset)
+            gpu += dataset_gpu_bytes(dataset, scalar_visibility=mapper.GetScalarVisibility(),
+                                     edges=prop.GetProperty().GetEdgeVisibility())
+        gpu += texture_gpu_bytes(prop.GetTexture())
+    elif isinstance(prop, vtkVolume):
+        mapper = prop.GetMapper()
+        dataset = mapper.GetInput() if mapper is not None else None
+        if dataset is not None:
+            key = dataset.GetAddressAsString('')
+            if key not in seen:
+                seen.add(key)
+                cpu += dataset_cpu_bytes(dataset)
+            # Volumes are uploaded as a 3D texture of their scalars
+            scalars = dataset.GetPointData().GetScalars()
+            if scalars is not None:
+                gpu += scalars.GetNumberOfValues() * scalars.GetDataTypeSize()
+    return {'cpu': cpu, 'gpu': gpu}
+
+
+def renderer_memory(renderer, seen=None) -> dict:
+    """Estimate the memory held by every prop of ``renderer``, by actor name."""
+    if seen is None:
+        seen = set()
+    names = {actor.GetAddressAsString(''): name for name, actor in renderer._actors.items()}
+    actors = {}
+    cpu = gpu = 0
+    props = renderer.GetViewProps()
+    props.InitTraversal()
+    for _ in range(props.GetNumberOfItems()):
+        prop = props.GetNextProp()
+        address = prop.GetAddressAsString('')
+        usage = prop_memory(prop, seen)
+        actors[names.get(address, address)] = usage
+        cpu += usage['cpu']
+        gpu += usage['gpu']
+    return {'cpu': cpu, 'gpu': gpu, 'actors': actors}
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _load(source):
+    if callable(source):
+        return source()
+    if isinstance(source, str):
+        import pyvista
+        return pyvista.read(source)
+    return source
+
+
+class TimeSeriesPlayer:
+    """Play back a sequence of meshes sharing one topology.
+
+    ``sources`` holds one entry per timestep, a dataset, a file name or a
+    callable returning a dataset. Upcoming steps, in the direction of
+    playback, are loaded by background workers into a ring buffer of
+    ``prefetch`` steps. Showing a step swaps its points and data arrays
+    into the displayed mesh; arrays shared with the previous step are left
+    alone and the cells are never touched.
+    """
+
+    def __init__(self, plotter, sources, name, prefetch=4, workers=2, **kwargs):
+        self.plotter = plotter
+        self.sources = list(sources)
+        self.name = name
+        self.prefetch = prefetch
+        self.kwargs = kwargs
+        self.mesh = None
+        self.step = None
+        self.hits = 0
+        self.misses = 0
+        self._direction = 1
+        self._buffer = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'playback-{name}')
+
+    def __len__(self):
+        return len(self.sources)
+
+    @property
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'buffered': sum(future.done() for future in self._buffer.values()),
+        }
+
+    def _request(self, step):
+        if step not in self._buffer:
+            self._buffer[step] = self._executor.submit(_load, self.sources[step])
+        return self._buffer[step]
+
+    def _prefetch(self, step):
+        window = [step + self._direction * ahead for ahead in range(1, self.prefetch + 1)]
+        window = [s for s in window if 0 <= s < len(self.sources)]
+        for s in list(self._buffer):
+            if s not in window:
+                self._buffer.pop(s).cancel()
+        for s in window:
+            self._request(s)
+
+    def show(self, step):
+        """Display timestep ``step``, loading it now if it was not prefetched."""
+        step = int(step) % len(self.sources)
+        future = self._buffer.pop(step, None)
+        if future is not None and future.done():
+            self.hits += 1
+        else:
+            self.misses += 1
+            if future is None:
+                future = self._executor.submit(_load, self.sources[step])
+        dataset = future.result()
+
+        if self.step is not None and step != self.step:
+            self._direction = 1 if step > self.step else -1
+        self._swap(dataset)
+        self.step = step
+        self._prefetch(step)
+        self.plotter.update()
+        return self.mesh
+
+    def next(self):
+        return self.show(0 if self.step is None else self.step + 1)
+
+    def previous(self):
+        return self.show(0 if self.step is None else self.step - 1)
+
+    def _swap(self, dataset):
+        if self.mesh is None:
+            import pyvista
+            self.mesh = pyvista.wrap(dataset).copy(deep=False)
+            self.plotter.add_mesh(self.mesh, name=self.name, **self.kwargs)
+            return
+        points = dataset.GetPoints()
+        if points is not None and points.GetData() != self.mesh.GetPoints().GetData():
+            self.mesh.SetPoints(points)
+        for source, target in ((dataset.GetPointData(), self.mesh.GetPointData()),
+                               (dataset.GetCellData(), self.mesh.GetCellData())):
+            for i in range(source.GetNumberOfArrays()):
+                array = source.GetAbstractArray(i)
+                if target.GetAbstractArray(array.GetName()) != array:
+                    target.AddArray(array)
+            target.Modified()
+        self.mesh.Modified()
+
+    def close(self):
+        for future in self._buffer.values():
+            future.cancel()
+        self._buffer.clear()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,230 @@
+import heapq
+import math
+
+import numpy as np
+
+_MAX_DEPTH = 21  # 3 * 21 bits fit in the 64 bit Morton codes
+
+
+def _spread_bits(values):
+    """Insert two zero bits between each of the lower 21 bits of ``values``."""
+    v = values.astype(np.uint64) & np.uint64(0x1fffff)
+    v = (v | (v << np.uint64(32))) & np.uint64(0x1f00000000ffff)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x1f0000ff0000ff)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x100f00f00f00f00f)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x10c30c30c30c30c3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return v
+
+
+def morton_codes(cells):
+    """Interleave the integer ``(n, 3)`` cell coordinates into Morton codes."""
+    return (_spread_bits(cells[:, 0]) | (_spread_bits(cells[:, 1]) << np.uint64(1))
+            | (_spread_bits(cells[:, 2]) << np.uint64(2)))
+
+
+def _decode(key, level):
+    ijk = [0, 0, 0]
+    for bit in range(level):
+        for axis in range(3):
+            ijk[axis] |= ((key >> (3 * bit + axis)) & 1) << bit
+    return np.array(ijk, dtype=float)
+
+
+class PointCloudOctree:
+    """Octree over a point cloud, stored as points sorted by Morton code.
+
+    Every node is a contiguous range of the sorted points, found by binary
+    search, so the tree needs no explicit node storage. Each node is drawn
+    from an evenly strided subset of at most ``node_samples`` of its
+    points, which spreads spatially because of the Morton order. Nodes at
+    the maximum depth cannot be refined and are drawn with all of their
+    points.
+    """
+
+    def __init__(self, points, scalars=None, max_depth=None, leaf_size=4096, node_samples=4096):
+        self.leaf_size = leaf_size
+        self.node_samples = node_samples
+        self._max_depth = max_depth
+        self._build(np.asarray(points, dtype=np.float32), None if scalars is None else np.asarray(scalars))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self, points, scalars):
+        self.lower = points.min(axis=0).astype(float)
+        self.size = float((points.max(axis=0) - self.lower).max()) or 1.0
+        self.depth = self._depth(len(points))
+        codes = self._codes(points)
+        order = np.argsort(codes, kind='stable')
+        self.codes = codes[order]
+        self.points = points[order]
+        self.scalars = None if scalars is None else scalars[order]
+
+    def _depth(self, n_points):
+        depth = self._max_depth
+        if depth is None:
+            depth = math.ceil(math.log(max(n_points / self.leaf_size, 1), 8)) + 1
+        return min(depth, _MAX_DEPTH)
+
+    def _codes(self, points):
+        n_cells = 2 ** self.depth
+        cells = np.floor((points - self.lower) / self.size * n_cells)
+        return morton_codes(np.clip(cells, 0, n_cells - 1).astype(np.uint64))
+
+    def extend(self, points, scalars=None):
+        """Add points, merging them into the sorted order without re-sorting.
+
+        Points outside the current root cube, or enough points to need a
+        deeper tree, trigger a full rebuild.
+        """
+        points = np.asarray(points, dtype=np.float32)
+        if (np.any(points < self.lower) or np.any(points > self.lower + self.size)
+                or self._depth(len(self.points) + len(points)) > self.depth):
+            merged = None if self.scalars is None else np.concatenate([self.scalars, scalars])
+            return self._build(np.concatenate([self.points, points]), merged)
+        codes = self._codes(points)
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        at = np.searchsorted(self.codes, codes, side='right')
+        self.codes = np.insert(self.codes, at, codes)
+        self.points = np.insert(self.points, at, points[order], axis=0)
+        if self.scalars is not None:
+            self.scalars = np.insert(self.scalars, at, np.asarray(scalars)[order], axis=0)
+
+    def node_range(self, level, key):
+        shift = np.uint64(3 * (self.depth - level))
+        lo = np.uint64(key) << shift
+        hi = np.uint64(key + 1) << shift
+        return int(np.searchsorted(self.codes, lo)), int(np.searchsorted(self.codes, hi))
+
+    def node_bounds(self, level, key):
+        size = self.size / 2 ** level
+        lower = self.lower + _decode(key, level) * size
+        return lower, lower + size
+
+    def node_samples_range(self, start, stop, samples=None):
+        step = max(1, math.ceil((stop - start) / (samples or self.node_samples)))
+        return np.arange(start, stop, step)
+
+    def select(self, camera_position, view_angle, viewport_height, point_budget, pixel_error=1.0, planes=None):
+        """Return the indices of the points to draw for the given view.
+
+        Nodes are refined in order of their screen-space error, roughly the
+        projected spacing between their drawn points in pixels, until it
+        drops under ``pixel_error`` or the ``point_budget`` is spent.
+        Nodes outside the frustum ``planes`` (``(6, 4)`` coefficients
+        facing inwards, as ``vtkCamera.GetFrustumPlanes`` returns) are
+        skipped.
+        """
+        camera_position = np.asarray(camera_position, dtype=float)
+        pixels_per_unit = viewport_height / (2 * math.tan(math.radians(view_angle) / 2))
+        planes = None if planes is None else np.asarray(planes, dtype=float).reshape(-1, 4)
+
+        def node(level, key):
+            start, stop = self.node_range(level, key)
+            if start == stop:
+                return None
+            lower, upper = self.node_bounds(level, key)
+            if planes is not None:
+                # Outside if the corner furthest along a plane normal is behind it
+                corner = np.where(planes[:, :3] >= 0, upper, lower)
+                if np.any(np.einsum('ij,ij->i', planes[:, :3], corner) + planes[:, 3] < 0):
+                    return None
+            samples = stop - start if level == self.depth else min(stop - start, self.node_samples)
+            distance = np.linalg.norm(np.clip(camera_position, lower, upper) - camera_position)
+            if stop - start <= samples:
+                error = 0.0
+            elif distance == 0:
+                error = math.inf
+            else:
+                error = (upper[0] - lower[0]) / samples ** (1 / 3) / distance * pixels_per_unit
+            return -error, level, key, start, stop, samples
+
+        root = node(0, 0)
+        if root is None:
+            return np.empty(0, dtype=np.int64)
+        heap = [root]
+        used = root[-1]
+        done = []
+        while heap:
+            entry = heapq.heappop(heap)
+            error, level, key, start, stop, samples = entry
+            if -error <= pixel_error:
+                done.append(entry)
+                done.extend(heap)
+                break
+            children = [child for child in (node(level + 1, key * 8 + i) for i in range(8)) if child is not None]
+            child_samples = sum(child[-1] for child in children)
+            if used - samples + child_samples > point_budget:
+                done.append(entry)
+                continue
+            used += child_samples - samples
+            for child in children:
+                heapq.heappush(heap, child)
+        if not done:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.node_samples_range(*entry[3:]) for entry in done])
+
+
+class PointCloudLOD:
+    """Keep a displayed subset of a :class:`PointCloudOctree` in step with the camera.
+
+    While the camera moves the cloud is drawn with ``interactive_budget``
+    points. Once it stops, every :meth:`update` doubles the budget up to
+    ``point_budget``, :attr:`refining` tells whether another frame would
+    add detail.
+    """
+
+    def __init__(self, plotter, octree, name, point_budget=2_000_000, interactive_budget=None, pixel_error=1.0,
+                 **kwargs):
+        import pyvista
+
+        self.plotter = plotter
+        self.octree = octree
+        self.name = name
+        self.point_budget = point_budget
+        self.interactive_budget = interactive_budget or point_budget // 8
+        self.pixel_error = pixel_error
+        self.budget = self.interactive_budget
+        self.refining = False
+        self._view = None
+        self._drawn = None
+
+        self.cloud = pyvista.PolyData(octree.points[:1])
+        if octree.scalars is not None:
+            self.cloud.point_arrays['values'] = octree.scalars[:1]
+            kwargs.setdefault('scalars', 'values')
+            kwargs.setdefault('clim', [float(np.nanmin(octree.scalars)), float(np.nanmax(octree.scalars))])
+        self.renderer = plotter.renderer
+        plotter.add_mesh(self.cloud, name=name, reset_camera=False, **kwargs)
+
+    def update(self):
+        """Refresh the displayed points, returns ``True`` when they changed."""
+        camera = self.renderer.GetActiveCamera()
+        width, height = self.renderer.GetSize()
+        view = (camera.GetMTime(), width, height)
+        if view != self._view:
+            self._view = view
+            self.budget = self.interactive_budget
+        elif self.budget < self.point_budget:
+            self.budget = min(self.budget * 2, self.point_budget)
+        else:
+            self.refining = False
+            return False
+        self.refining = self.budget < self.point_budget
+
+        planes = [0.0] * 24
+        camera.GetFrustumPlanes(width / max(height, 1), planes)
+        indices = self.octree.select(camera.GetPosition(), camera.GetViewAngle(), max(height, 1), self.budget,
+                                     self.pixel_error, planes)
+        if self._drawn is not None and np.array_equal(indices, self._drawn):
+            return False
+        self._drawn = indices
+
+        import pyvista
+        subset = pyvista.PolyData(self.octree.points[indices])
+        if self.octree.scalars is not None:
+            subset.point_arrays['values'] = self.octree.scalars[indices]
+        self.cloud.shallow_copy(subset)
+        return True
@@ -0,0 +1,214 @@
+import json
+import struct
+import time
+import zlib
+from functools import partial
+
+import numpy as np
+from PySide2.QtCore import QByteArray, QEvent, QObject, QPoint, QPointF, Qt, Signal
+from PySide2.QtGui import QMouseEvent, QWheelEvent
+from PySide2.QtNetwork import QHostAddress
+from PySide2.QtWebSockets import QWebSocketServer
+
+from QMLPyVista.headless import HeadlessSession
+
+# magic, frame number, width, height, tile size, number of tiles
+FRAME_HEADER = struct.Struct('<4sIIIHI')
+# tile column, tile row, length of the compressed RGB rows
+TILE_HEADER = struct.Struct('<HHI')
+
+_MOUSE_EVENTS = {'press': QEvent.MouseButtonPress, 'release': QEvent.MouseButtonRelease,
+                 'move': QEvent.MouseMove, 'dblclick': QEvent.MouseButtonDblClick}
+_BUTTONS = {'left': Qt.LeftButton, 'right': Qt.RightButton, 'middle': Qt.MiddleButton, None: Qt.NoButton}
+_MODIFIERS = {'ctrl': Qt.ControlModifier, 'shift': Qt.ShiftModifier, 'alt': Qt.AltModifier}
+
+
+def encode_tiles(image, reference=None, tile_size=64, level=1):
+    """Return the zlib compressed ``(column, row, bytes)`` tiles of ``image`` that differ from ``reference``.
+
+    Every tile is sent when there is no ``reference`` or it has another
+    shape. Tiles hold RGB rows, top down.
+    """
+    height, width = image.shape[:2]
+    full = reference is None or reference.shape != image.shape
+    tiles = []
+    for row, y in enumerate(range(0, height, tile_size)):
+        for column, x in enumerate(range(0, width, tile_size)):
+            tile = image[y:y + tile_size, x:x + tile_size]
+            if not full and np.array_equal(tile, reference[y:y + tile_size, x:x + tile_size]):
+                continue
+            tiles.append((column, row, zlib.compress(np.ascontiguousarray(tile).tobytes(), level)))
+    return tiles
+
+
+class _Client:
+    def __init__(self, socket, level):
+        self.socket = socket
+        self.level = level
+        self.reference = None
+        self.in_flight = 0
+        self.waiting = False
+        self.sent_bytes = 0
+        self.rate = None
+        self.sent_at = {}
+
+
+class RenderServer(QObject):
+    """Serve an offscreen ``FboItem`` to remote viewers over a WebSocket.
+
+    Clients send JSON text messages, ``{"type": "mouse", "event":
+    "press", "x": 10, "y": 20, "button": "left", "modifiers": ["ctrl"]}``
+    (events ``press``, ``release``, ``move`` and ``dblclick``), ``{"type":
+    "wheel", "x": 10, "y": 20, "delta": 120}``, ``{"type": "resize",
+    "width": 800, "height": 600}`` and ``{"type": "ack", "frame": 12}``
+    once a frame is displayed. They are turned into the Qt events the item
+    receives from a window.
+
+    Every rendered frame is sent as a binary message: ``FRAME_HEADER``
+    followed by the tiles that changed since the last frame sent to that
+    client, each a ``TILE_HEADER`` and its zlib compressed RGB rows. At
+    most ``window`` frames are in flight per client, a slow client skips
+    frames and gets the newest one once it acknowledges, so the frame rate
+    follows its bandwidth.
+
+    The throughput of each client is measured from its acknowledgements.
+    Frames that would take longer than ``frame_time`` seconds to reach it
+    are compressed harder, up to zlib level ``max_level``, and the level
+    goes back down towards ``level`` when there is bandwidth to spare.
+    """
+
+    _frameReady = Signal(int, object)
+
+    def __init__(self, port=8765, host='127.0.0.1', size=(640, 480), tile_size=64, window=2, level=1,
+                 max_level=9, frame_time=1 / 30, session=None):
+        session = session or HeadlessSession(size)
+        super().__init__()
+        self.session = session
+        self.item = self.session.item
+        self.tile_size = tile_size
+        self.window = window
+        self.level = level
+        self.max_level = max_level
+        self.frame_time = frame_time
+        self.frame = None
+        self.clients = []
+        self._frameReady.connect(self._send_frame)
+        self.item.add_frame_hook(self._capture)
+
+        self._server = QWebSocketServer('QMLPyVista', QWebSocketServer.NonSecureMode, self)
+        if not self._server.listen(QHostAddress(host), port):
+            raise OSError(self._server.errorString())
+        self._server.newConnection.connect(self._connect)
+
+    @property
+    def port(self) -> int:
+        return self._server.serverPort()
+
+    def close(self):
+        self.item.remove_frame_hook(self._capture)
+        for client in self.clients:
+            client.socket.close()
+        self._server.close()
+
+    def _capture(self, frame, image):
+        # Render thread, hand a copy of the RGB frame over to the GUI thread
+        self._frameReady.emit(frame, np.ascontiguousarray(image[..., :3]))
+
+    def _connect(self):
+        socket = self._server.nextPendingConnection()
+        client = _Client(socket, self.level)
+        self.clients.append(client)
+        socket.textMessageReceived.connect(partial(self._message, client))
+        socket.disconnected.connect(partial(self._disconnect, client))
+        if self.frame is not None:
+            self._send(client, *self.frame)
+        self.item.update()
+
+    def _disconnect(self, client):
+        if client in self.clients:
+            self.clients.remove(client)
+        client.socket.deleteLater()
+
+    def _message(self, client, text):
+        message = json.loads(text)
+        kind = message.get('type')
+        if kind == 'ack':
+            self._ack(client, message.get('frame'))
+        elif kind == 'mouse':
+            self._mouse(message)
+        elif kind == 'wheel':
+            self._wheel(message)
+        elif kind == 'resize':
+            self.session.window.resize(int(message['width']), int(message['height']))
+            self.item.update()
+
+    @staticmethod
+    def _modifiers(message):
+        modifiers = Qt.NoModifier
+        for name in message.get('modifiers', ()):
+            modifiers |= _MODIFIERS[name]
+        return modifiers
+
+    def _mouse(self, message):
+        event_type = _MOUSE_EVENTS[message['event']]
+        button = _BUTTONS[message.get('button')]
+        buttons = Qt.NoButton if event_type == QEvent.MouseButtonRelease else button
+        event = QMouseEvent(event_type, QPointF(message['x'], message['y']),
+                            Qt.NoButton if event_type == QEvent.MouseMove else button, buttons,
+                            self._modifiers(message))
+        if event_type == QEvent.MouseButtonRelease:
+            self.item.mouseReleaseEvent(event)
+        elif event_type == QEvent.MouseMove:
+            self.item.mouseMoveEvent(event)
+        else:
+            self.item.mousePressEvent(event)
+
+    def _wheel(self, message):
+        position = QPointF(message['x'], message['y'])
+        event = QWheelEvent(position, position, QPoint(), QPoint(0, int(message['delta'])), Qt.NoButton,
+                            self._modifiers(message), Qt.NoScrollPhase, False)
+        self.item.wheelEvent(event)
+
+    def _ack(self, client, frame):
+        client.in_flight = max(0, client.in_flight - 1)
+        sent = client.sent_at.pop(frame, None)
+        if sent is not None:
+            seconds, size = time.perf_counter() - sent[0], sent[1]
+            # Smoothed throughput in bytes per second, as seen by the client
+            rate = size / max(seconds, 1e-6)
+            client.rate = rate if client.rate is None else 0.8 * client.rate + 0.2 * rate
+            self._adapt_level(client, size)
+        if client.waiting and self.frame is not None:
+            self._send(client, *self.frame)
+
+    def _send_frame(self, frame, image):
+        self.frame = frame, image
+        for client in self.clients:
+            self._send(client, frame, image)
+
+    def _send(self, client, frame, image):
+        if client.in_flight >= self.window:
+            client.waiting = True
+            return
+        client.waiting = False
+        tiles = encode_tiles(image, client.reference, self.tile_size, client.level)
+        if not tiles:
+            return
+        height, width = image.shape[:2]
+        message = bytearray(FRAME_HEADER.pack(b'QPVF', frame, width, height, self.tile_size, len(tiles)))
+        for column, row, data in tiles:
+            message += TILE_HEADER.pack(column, row, len(data))
+            message += data
+        client.socket.sendBinaryMessage(QByteArray(bytes(message)))
+        client.reference = image
+        client.in_flight += 1
+        client.sent_bytes += len(message)
+        client.sent_at[frame] = time.perf_counter(), len(message)
+
+    def _adapt_level(self, client, size):
+        # Trade encoding time for bandwidth on slow links
+        seconds = size / client.rate
+        if seconds > self.frame_time and client.level < self.max_level:
+            client.level += 1
+        elif seconds < self.frame_time / 2 and client.level > self.level:
+            client.level -= 1
@@ -0,0 +1,183 @@
+class _MapperSet:
+    """Insertion ordered set of mappers exposing the list API pyvista uses.
+
+    Membership changes are reported to the registry so that its
+    mapper-to-bar index stays current without any scans.
+    """
+
+    def __init__(self, registry, title, mappers=()):
+        self._registry = registry
+        self._title = title
+        self._mappers = {}
+        for mapper in mappers:
+            self.append(mapper)
+
+    def append(self, mapper):
+        if mapper in self._mappers:
+            return
+        self._mappers[mapper] = None
+        self._registry._index.setdefault(mapper, set()).add(self._title)
+
+    def extend(self, mappers):
+        for mapper in mappers:
+            self.append(mapper)
+
+    def remove(self, mapper):
+        try:
+            del self._mappers[mapper]
+        except KeyError:
+            raise ValueError(f'{mapper} not in scalar bar {self._title}')
+        titles = self._registry._index.get(mapper)
+        if titles is not None:
+            titles.discard(self._title)
+            if not titles:
+                del self._registry._index[mapper]
+
+    def _unindex(self):
+        for mapper in list(self._mappers):
+            self.remove(mapper)
+
+    def __iter__(self):
+        return iter(list(self._mappers))
+
+    def __len__(self):
+        return len(self._mappers)
+
+    def __contains__(self, mapper):
+        return mapper in self._mappers
+
+    def __getitem__(self, index):
+        return list(self._mappers)[index]
+
+
+class _MapperDict(dict):
+    """``title -> mappers`` mapping which keeps the registry index in sync."""
+
+    def __init__(self, registry, mappers=None):
+        super().__init__()
+        self._registry = registry
+        for title, value in (mappers or {}).items():
+            self[title] = value
+
+    def __setitem__(self, title, mappers):
+        if title in self:
+            super().__getitem__(title)._unindex()
+        super().__setitem__(title, _MapperSet(self._registry, title, mappers))
+
+    def __delitem__(self, title):
+        super().__getitem__(title)._unindex()
+        super().__delitem__(title)
+
+    def pop(self, title, *default):
+        if title in self:
+            super().__getitem__(title)._unindex()
+        return super().pop(title, *default)
+
+    def clear(self):
+        for mappers in self.values():
+            mappers._unindex()
+        super().clear()
+
+
+class ScalarBarRegistry:
+    """Scalar-bar bookkeeping with a mapper-to-bar index.
+
+    Holds the containers pyvista expects on a plotter
+    (``_scalar_bar_mappers``, ``_scalar_bar_ranges``,
+    ``_scalar_bar_slot_lookup``, ``_scalar_bar_slots`` and
+    ``_scalar_bar_actors``) and indexes mappers so that removing an actor
+    only touches the bars it contributes to. Range changes are collected
+    and applied to the mappers once per frame by :meth:`flush`, moving
+    mappers using a table shared through ``lookup_tables`` to the table of
+    the new range rather than modifying it.
+    """
+
+    def __init__(self, lookup_tables=None):
+        self.lookup_tables = lookup_tables
+        self._index = {}
+        self._dirty = set()
+        self.mappers = _MapperDict(self)
+        self.ranges = {}
+        self.slot_lookup = {}
+        self.slots = set()
+        self.actors = {}
+
+    def set_mappers(self, mappers):
+        self.mappers.clear()
+        self.mappers = _MapperDict(self, mappers)
+        self._dirty.intersection_update(self.mappers)
+
+    def refcount(self, title) -> int:
+        """Return the number of mappers sharing the scalar bar ``title``."""
+        mappers = self.mappers.get(title)
+        return 0 if mappers is None else len(mappers)
+
+    def titles(self, mapper):
+        """Return the titles of the scalar bars ``mapper`` contributes to."""
+        return set(self._index.get(mapper, ()))
+
+    def add_mapper(self, title, mapper):
+        """Attach ``mapper`` to the existing bar ``title``, widening its range."""
+        clim = list(self.ranges[title])
+        new_range = mapper.GetScalarRange()
+        clim[0] = min(clim[0], new_range[0])
+        clim[1] = max(clim[1], new_range[1])
+        self.mappers[title].append(mapper)
+        self.set_range(title, clim)
+
+    def set_range(self, title, clim):
+        """Schedule ``clim`` for every mapper of ``title`` on the next flush."""
+        self.ranges[title] = list(clim)
+        self._dirty.add(title)
+
+    def flush(self) -> bool:
+        """Apply pending range updates, once per scalar bar."""
+        if not self._dirty:
+            return False
+        for title in self._dirty:
+            clim = self.ranges.get(title)
+            if clim is None or title not in self.mappers:
+                continue
+            bar = self.actors.get(title)
+            for mapper in self.mappers[title]:
+                table = self.set_mapper_range(mapper, clim)
+                if table is not None and bar is not None and bar.GetLookupTable() is not table:
+                    bar.SetLookupTable(table)
+        self._dirty.clear()
+        return True
+
+    def set_mapper_range(self, mapper, clim):
+        """Set the scalar range of ``mapper`` and its lookup table, returns the table."""
+        mapper.SetScalarRange(*clim)
+        table = mapper.GetLookupTable()
+        if table is None:
+            return None
+        if self.lookup_tables is None:
+            table.SetRange(*clim)
+            return table
+        new_table = self.lookup_tables.with_range(table, clim)
+        if new_table is not table:
+            mapper.SetLookupTable(new_table)
+        return new_table
+
+    def remove_mapper(self, plotter, mapper, reset_camera=False, render=False):
+        """Detach ``mapper`` from its scalar bars, removing bars left empty."""
+        for title in self.titles(mapper):
+            mappers = self.mappers[title]
+            mappers.remove(mapper)
+            if len(mappers) > 0:
+                continue
+            slot = self.slot_lookup.pop(title, None)
+            if slot is not None:
+                self.mappers.pop(title)
+                self.ranges.pop(title, None)
+                self._dirty.discard(title)
+                plotter.remove_actor(self.actors.pop(title), reset_camera=reset_camera, render=render)
+                self.slots.add(slot)
+
+    def remove_actor(self, plotter, actor, reset_camera=False, render=False):
+        try:
+            mapper = actor.GetMapper()
+        except AttributeError:
+            return
+        self.remove_mapper(plotter, mapper, reset_camera=reset_camera, render=render)
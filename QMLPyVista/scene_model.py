@@ -0,0 +1,203 @@
+from PySide2.QtCore import QAbstractListModel, QByteArray, QModelIndex, Qt, Signal, Slot
+from PySide2.QtGui import QColor, QVector3D
+
+_ROLES = ['name', 'kind', 'renderer', 'visible', 'color', 'opacity', 'pointSize', 'lineWidth', 'representation',
+          'position', 'focalPoint', 'viewUp', 'viewAngle', 'background']
+_ROLE_IDS = {name: Qt.UserRole + 1 + i for i, name in enumerate(_ROLES)}
+_REPRESENTATIONS = {'points': 0, 'wireframe': 1, 'surface': 2}
+
+
+def _color(value):
+    if isinstance(value, QColor):
+        return value.redF(), value.greenF(), value.blueF()
+    from pyvista import parse_color
+    return parse_color(value)
+
+
+def _vector(value):
+    if isinstance(value, QVector3D):
+        return value.x(), value.y(), value.z()
+    return tuple(float(v) for v in value)
+
+
+class SceneModel(QAbstractListModel):
+    """Declarative description of the scene, editable from QML and Python.
+
+    Rows are either ``actor`` entries, referring to an actor by its name,
+    or ``renderer`` entries holding the background and camera of a
+    subplot. Edits only record the difference; :meth:`apply` pushes the
+    pending differences into VTK once per frame, from
+    ``FboRenderer.synchronize``, however many properties changed.
+    Differences for actors that do not exist yet stay pending, and an
+    actor added under the name of an entry gets the whole entry applied.
+    """
+
+    sceneChanged = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = []
+        self._rows = {}
+        self._pending = {}
+
+    def roleNames(self):
+        return {role: QByteArray(name.encode()) for name, role in _ROLE_IDS.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._entries):
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.DisplayRole:
+            return entry['name']
+        for name, role_id in _ROLE_IDS.items():
+            if role_id == role:
+                return entry.get(name)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        for name, role_id in _ROLE_IDS.items():
+            if role_id == role and name not in ('name', 'kind', 'renderer'):
+                self.setValue(self._entries[index.row()]['name'], name, value)
+                return True
+        return False
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def _add(self, entry):
+        if entry['name'] in self._rows:
+            row = self._rows[entry['name']]
+            self._entries[row].update(entry)
+            self.dataChanged.emit(self.index(row), self.index(row))
+        else:
+            row = len(self._entries)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._entries.append(entry)
+            self._rows[entry['name']] = row
+            self.endInsertRows()
+        changes = {k: v for k, v in entry.items() if k not in ('name', 'kind', 'renderer')}
+        if changes:
+            self._pending.setdefault(entry['name'], {}).update(changes)
+            self.sceneChanged.emit()
+
+    def add_actor(self, name, renderer=0, **properties):
+        """Describe the actor ``name`` of subplot ``renderer``, applying ``properties``."""
+        self._add(dict(properties, name=name, kind='actor', renderer=renderer))
+
+    def add_renderer(self, name, renderer=0, **properties):
+        """Describe the background and camera of subplot ``renderer``."""
+        self._add(dict(properties, name=name, kind='renderer', renderer=renderer))
+
+    @Slot(str)
+    def remove(self, name):
+        row = self._rows.pop(name, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._entries[row]
+        self.endRemoveRows()
+        self._rows = {entry['name']: i for i, entry in enumerate(self._entries)}
+        self._pending.pop(name, None)
+
+    @Slot(str, str, 'QVariant', result=bool)
+    def setValue(self, name, key, value):
+        """Set property ``key`` of the entry ``name``, applied on the next frame.
+
+        Returns ``False`` for an unknown entry or property.
+        """
+        row = self._rows.get(name)
+        if row is None or key not in _ROLE_IDS or key in ('name', 'kind', 'renderer'):
+            return False
+        entry = self._entries[row]
+        if entry.get(key) == value:
+            return True
+        entry[key] = value
+        self._pending.setdefault(name, {})[key] = value
+        self.dataChanged.emit(self.index(row), self.index(row), [_ROLE_IDS[key]])
+        self.sceneChanged.emit()
+        return True
+
+    @Slot(str, str, result='QVariant')
+    def value(self, name, key):
+        row = self._rows.get(name)
+        return None if row is None else self._entries[row].get(key)
+
+    def actor_added(self, name):
+        """Schedule the whole entry ``name`` for its newly added actor."""
+        row = self._rows.get(name)
+        if row is None or self._entries[row]['kind'] != 'actor':
+            return
+        changes = {k: v for k, v in self._entries[row].items() if k not in ('name', 'kind', 'renderer')}
+        if changes:
+            self._pending.setdefault(name, {}).update(changes)
+            self.sceneChanged.emit()
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def apply(self, item) -> bool:
+        """Apply the differences recorded since the last call to the VTK scene."""
+        if not self._pending:
+            return False
+        applied = False
+        for name, changes in list(self._pending.items()):
+            row = self._rows.get(name)
+            if row is None:
+                del self._pending[name]
+                continue
+            entry = self._entries[row]
+            if entry['renderer'] >= len(item.renderers):
+                continue
+            renderer = item.renderers[entry['renderer']]
+            if entry['kind'] == 'actor':
+                actor = renderer._actors.get(name)
+                if actor is None:
+                    # Kept until the actor is added
+                    continue
+                self._apply_actor(actor, changes)
+            else:
+                self._apply_renderer(renderer, changes)
+            del self._pending[name]
+            applied = True
+        return applied
+
+    @staticmethod
+    def _apply_actor(actor, changes):
+        prop = actor.GetProperty()
+        for key, value in changes.items():
+            if key == 'visible':
+                actor.SetVisibility(bool(value))
+            elif key == 'color':
+                prop.SetColor(_color(value))
+            elif key == 'opacity':
+                prop.SetOpacity(float(value))
+            elif key == 'pointSize':
+                prop.SetPointSize(float(value))
+            elif key == 'lineWidth':
+                prop.SetLineWidth(float(value))
+            elif key == 'representation':
+                prop.SetRepresentation(_REPRESENTATIONS[str(value).lower()])
+            elif key == 'position':
+                actor.SetPosition(_vector(value))
+
+    @staticmethod
+    def _apply_renderer(renderer, changes):
+        camera = renderer.GetActiveCamera()
+        for key, value in changes.items():
+            if key == 'background':
+                renderer.set_background(_color(value))
+            elif key == 'position':
+                camera.SetPosition(_vector(value))
+            elif key == 'focalPoint':
+                camera.SetFocalPoint(_vector(value))
+            elif key == 'viewUp':
+                camera.SetViewUp(_vector(value))
+            elif key == 'viewAngle':
+                camera.SetViewAngle(float(value))
+        renderer.ResetCameraClippingRange()
@@ -0,0 +1,256 @@
+import json
+import os
+import struct
+import tempfile
+from multiprocessing import shared_memory
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+
+_MAGIC = b'QPVFRM01'
+# magic, number of slots, length of the JSON layout, bytes per slot, frames written, slot held by the reader
+_HEADER = struct.Struct('<8sIIQQq')
+_ALIGN = 64
+
+
+def _aligned(n):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class _Layout:
+    """Offsets of the header fields, slot markers and arrays of a frame buffer.
+
+    The block starts with ``_HEADER``, followed by one ``uint64`` marker per
+    slot, the JSON description of the arrays and then the slots. A marker
+    is odd while its slot is written and ``2 * sequence + 2`` once frame
+    ``sequence`` is complete in it.
+    """
+
+    def __init__(self, arrays, n_slots):
+        self.arrays = arrays
+        self.n_slots = n_slots
+        self.description = json.dumps(
+            [[name, np.dtype(dtype).str, list(shape)] for name, (shape, dtype) in arrays.items()]).encode()
+        self.offsets = {}
+        offset = 0
+        for name, (shape, dtype) in arrays.items():
+            self.offsets[name] = offset
+            offset = _aligned(offset + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        self.slot_bytes = max(offset, _ALIGN)
+        self.markers = _HEADER.size
+        self.slots = _aligned(self.markers + 8 * n_slots + len(self.description))
+
+    @property
+    def size(self):
+        return self.slots + self.n_slots * self.slot_bytes
+
+    @classmethod
+    def read(cls, buffer):
+        magic, n_slots, length, slot_bytes, _, _ = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise ValueError('Shared memory block does not hold QMLPyVista frames')
+        start = _HEADER.size + 8 * n_slots
+        description = json.loads(bytes(buffer[start:start + length]))
+        return cls({name: (tuple(shape), np.dtype(dtype)) for name, dtype, shape in description}, n_slots)
+
+
+class _SlotLock:
+    """Lock shared by the writer and readers of a block, around claiming and publishing slots.
+
+    Shared memory gives no ordering between the processes, so the slot
+    markers and the held slot are only read and written while holding it.
+    It locks a file named after the block in the temporary directory.
+    """
+
+    def __init__(self, name):
+        self.path = os.path.join(tempfile.gettempdir(), f'{name.lstrip("/")}.lock')
+        self._file = open(self.path, 'a+b')
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def close(self, unlink=False):
+        self._file.close()
+        if unlink:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class _FrameBuffer:
+    def __init__(self, shm, layout):
+        self.shm = shm
+        self.layout = layout
+        self._lock = _SlotLock(shm.name)
+        self._markers = np.ndarray((layout.n_slots,), dtype=np.uint64, buffer=shm.buf, offset=layout.markers)
+        # The writer only stores the sequence and the reader the held slot, each as one word
+        self._sequence = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=_HEADER.size - 16)
+        self._held = np.ndarray((1,), dtype=np.int64, buffer=shm.buf, offset=_HEADER.size - 8)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def sequence(self) -> int:
+        """Number of complete frames written so far."""
+        return int(self._sequence[0])
+
+    def _views(self, slot):
+        base = self.layout.slots + slot * self.layout.slot_bytes
+        return {name: np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=base + self.layout.offsets[name])
+                for name, (shape, dtype) in self.layout.arrays.items()}
+
+
+class SharedFrameWriter(_FrameBuffer):
+    """Producer side of a shared memory ring of frames, for solvers in other processes.
+
+    ``arrays`` maps the name of every array of a frame to its ``(shape,
+    dtype)``, these are fixed for the lifetime of the buffer. ``points``
+    replaces the points of the mesh, other arrays its point or cell data::
+
+        writer = SharedFrameWriter({'points': ((n, 3), 'f4'), 'pressure': ((n,), 'f4')})
+        # hand writer.name to the GUI process, then for every step
+        writer.write(points=xyz, pressure=p)
+
+    The slot the reader currently displays is never written, nor the one
+    of the last frame while another is free, so ``n_slots`` of three lets
+    the solver keep writing while one frame is displayed and the newest is
+    waiting to be. Slots are claimed and published under a lock shared
+    with the reader, the copy itself runs outside of it.
+    """
+
+    def __init__(self, arrays, n_slots=3, name=None):
+        if n_slots < 2:
+            raise ValueError('At least two slots are needed')
+        layout = _Layout({name: (tuple(shape), np.dtype(dtype)) for name, (shape, dtype) in arrays.items()}, n_slots)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=layout.size)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, n_slots, len(layout.description), layout.slot_bytes, 0, -1)
+        start = layout.markers + 8 * n_slots
+        shm.buf[start:start + len(layout.description)] = layout.description
+        super().__init__(shm, layout)
+        self._markers[:] = 0
+        self._slot = -1
+
+    def write(self, arrays=None, **kwargs):
+        """Copy one frame into the next free slot and publish it, returns its sequence number."""
+        arrays = dict(arrays or {}, **kwargs)
+        with self._lock:
+            sequence = self.sequence
+            held = self._held[0]
+            # Round robin from the last slot written, which comes last
+            slot = next(slot % self.layout.n_slots
+                        for slot in range(self._slot + 1, self._slot + 1 + self.layout.n_slots)
+                        if slot % self.layout.n_slots != held)
+            self._markers[slot] = 2 * sequence + 1
+        self._slot = slot
+        for name, view in self._views(slot).items():
+            view[...] = arrays[name]
+        with self._lock:
+            self._markers[slot] = 2 * sequence + 2
+            self._sequence[0] = sequence + 1
+        return sequence
+
+    def close(self, unlink=True):
+        self._markers = self._sequence = self._held = None
+        self._lock.close(unlink)
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class SharedFrameReader(_FrameBuffer):
+    """Consumer side of a :class:`SharedFrameWriter`, attached by the name of its block.
+
+    :meth:`latest` returns views of the newest complete frame, without
+    copying. Its slot stays held, and so is left alone by the writer, until
+    the next call returns a newer frame. Frames written in between are
+    dropped and counted in :attr:`dropped`.
+    """
+
+    def __init__(self, name):
+        shm = shared_memory.SharedMemory(name=name)
+        super().__init__(shm, _Layout.read(shm.buf))
+        self.consumed = 0
+        self.dropped = 0
+        self._frame = None
+
+    @property
+    def pending(self) -> bool:
+        return self.sequence > self.consumed
+
+    def latest(self):
+        """Return ``(sequence, arrays)`` of the newest frame, or ``None`` if nothing new arrived."""
+        with self._lock:
+            sequence = self.sequence
+            if sequence <= self.consumed:
+                return None
+            frame = sequence - 1
+            slot = next((s for s in range(self.layout.n_slots) if self._markers[s] == 2 * frame + 2), None)
+            if slot is None:
+                # Only with two slots, the newest frame is being overwritten
+                return None
+            self._held[0] = slot
+        self.dropped += sequence - self.consumed - 1
+        self.consumed = sequence
+        self._frame = frame, self._views(slot)
+        return self._frame
+
+    def close(self):
+        with self._lock:
+            self._held[0] = -1
+        self._lock.close()
+        self._frame = None
+        self._markers = self._sequence = self._held = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Arrays still wrapped by VTK use the mapping, it is released with them
+            pass
+
+
+def map_frame(dataset, arrays):
+    """Point the arrays of ``dataset`` at the ``arrays`` of a frame, without copying.
+
+    ``points`` replaces the points, every other array is added to the
+    point or cell data depending on its length, replacing any array of the
+    same name.
+    """
+    from vtkmodules.util.numpy_support import numpy_to_vtk
+    from vtkmodules.vtkCommonCore import vtkPoints
+
+    for name, array in arrays.items():
+        vtk_array = numpy_to_vtk(array, deep=False)
+        if name == 'points':
+            if dataset.GetPoints() is None:
+                dataset.SetPoints(vtkPoints())
+            dataset.GetPoints().SetData(vtk_array)
+            continue
+        if len(array) == dataset.GetNumberOfPoints():
+            attributes = dataset.GetPointData()
+        elif len(array) == dataset.GetNumberOfCells():
+            attributes = dataset.GetCellData()
+        else:
+            raise ValueError(f'Array {name!r} of length {len(array)} matches neither the points nor the cells')
+        vtk_array.SetName(name)
+        attributes.AddArray(vtk_array)
+    dataset.Modified()
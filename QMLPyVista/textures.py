@@ -0,0 +1,229 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from vtkmodules.util.numpy_support import vtk_to_numpy
+from vtkmodules.vtkRenderingCore import vtkTexture
+
+from QMLPyVista.memory import texture_gpu_bytes
+
+
+def _pixels(image):
+    """Return the pixel array of an image array or of the input of a ``vtkTexture``."""
+    if isinstance(image, vtkTexture):
+        data = image.GetInput()
+        scalars = None if data is None else data.GetPointData().GetScalars()
+        if scalars is None:
+            return None
+        return vtk_to_numpy(scalars)
+    return np.asarray(image)
+
+
+class TextureCache:
+    """Content-hashed cache of ``vtkTexture`` objects shared between actors.
+
+    Identical images, given as arrays or as the input of separate
+    textures, map to one texture, so they are uploaded once per render
+    window whatever the number of actors and subplots using them. Actors
+    hold a reference on their texture; unreferenced textures stay on the
+    GPU until the cache exceeds ``budget`` bytes, then the least recently
+    used are released through ``release(texture)``.
+
+    Each array or texture input is only hashed once: an array seen before
+    is assumed unchanged, pass a new array rather than modifying one in
+    place, while a texture is hashed again when its input is modified.
+    With ``mipmap`` the levels are generated by the GPU when the texture
+    is uploaded, there is no CPU side mipmap to build in advance.
+    """
+
+    def __init__(self, budget=512 * 2 ** 20, release=None):
+        self.budget = budget
+        self.release_texture = release
+        self._textures = OrderedDict()
+        self._bytes = {}
+        self._refs = {}
+        self._owners = {}
+        self._keys = {}
+        self._digests = {}
+        self._lock = threading.RLock()
+        self._executor = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._textures)
+
+    def __contains__(self, texture):
+        with self._lock:
+            return self._keys.get(texture.GetAddressAsString('')) in self._textures
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self._bytes.values())
+
+    @staticmethod
+    def key(pixels, mipmap=False, interpolate=True, repeat=False):
+        return TextureCache._content_key(pixels) + (bool(mipmap), bool(interpolate), bool(repeat))
+
+    @staticmethod
+    def _content_key(pixels):
+        pixels = np.ascontiguousarray(pixels)
+        digest = hashlib.blake2b(pixels.view(np.uint8).ravel(), digest_size=16).hexdigest()
+        return digest, pixels.shape, pixels.dtype.str
+
+    def _identity_key(self, image, pixels):
+        # Skips hashing objects seen before, textures are hashed again once their input changed
+        version = image.GetInput().GetMTime() if isinstance(image, vtkTexture) else None
+        ident = id(image)
+        with self._lock:
+            cached = self._digests.get(ident)
+        if cached is not None and cached[0]() is image and cached[1] == version:
+            return cached[2]
+        content = self._content_key(pixels)
+        try:
+            ref = weakref.ref(image, lambda _, digests=self._digests: digests.pop(ident, None))
+        except TypeError:
+            return content
+        with self._lock:
+            self._digests[ident] = (ref, version, content)
+        return content
+
+    def get(self, image, mipmap=False, interpolate=None, repeat=None):
+        """Return the shared texture for ``image``, an array or a ``vtkTexture``, building it on a miss.
+
+        ``interpolate`` and ``repeat`` default to those of a given texture,
+        to on and off for arrays.
+        """
+        pixels = _pixels(image)
+        if pixels is None:
+            return image
+        textured = isinstance(image, vtkTexture)
+        if interpolate is None:
+            interpolate = bool(image.GetInterpolate()) if textured else True
+        if repeat is None:
+            repeat = bool(image.GetRepeat()) if textured else False
+        key = self._identity_key(image, pixels) + (bool(mipmap), bool(interpolate), bool(repeat))
+        with self._lock:
+            texture = self._textures.get(key)
+            if texture is not None:
+                self.hits += 1
+                self._textures.move_to_end(key)
+                return texture
+            self.misses += 1
+        texture = self._build(image, mipmap, interpolate, repeat)
+        with self._lock:
+            if key in self._textures:
+                # Built concurrently by prepare(), keep the first one
+                return self._textures[key]
+            self._textures[key] = texture
+            self._keys[texture.GetAddressAsString('')] = key
+            self._bytes[key] = texture_gpu_bytes(texture)
+            self._refs[key] = 0
+            self._evict()
+        return texture
+
+    def prepare(self, image, mipmap=False, interpolate=None, repeat=None):
+        """Hash and convert ``image`` on a background thread, returns a future of :meth:`get`.
+
+        Mipmaps are not built here, the GPU generates them on upload.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='textures')
+        return self._executor.submit(self.get, image, mipmap, interpolate, repeat)
+
+    @staticmethod
+    def _build(image, mipmap, interpolate, repeat):
+        if isinstance(image, vtkTexture):
+            texture = image
+        else:
+            import pyvista
+            texture = pyvista.Texture(np.asarray(image))
+        texture.SetInterpolate(interpolate)
+        texture.SetRepeat(repeat)
+        # Mipmaps are generated when the texture is uploaded
+        texture.SetMipmap(mipmap)
+        if mipmap:
+            texture.SetMaximumAnisotropicFiltering(8)
+        return texture
+
+    def set_budget(self, budget):
+        """Change the budget in bytes, releasing unused textures beyond it right away."""
+        with self._lock:
+            self.budget = int(budget)
+            self._evict()
+
+    def acquire(self, owner, texture):
+        """Record that ``owner``, usually an actor, uses the cached ``texture``."""
+        with self._lock:
+            key = self._keys.get(texture.GetAddressAsString(''))
+            if key is None or key not in self._textures:
+                return
+            owner_key = owner.GetAddressAsString('')
+            if self._owners.get(owner_key) == key:
+                return
+            self.release(owner)
+            self._owners[owner_key] = key
+            self._refs[key] += 1
+
+    def release(self, owner):
+        """Drop the reference of ``owner`` on its texture.
+
+        ``owner`` keeps the texture, so it shows again if added back. To
+        keep the texture on the GPU for the other actors using it, detach
+        it while releasing the graphics resources of ``owner``, see
+        :meth:`detached`.
+        """
+        with self._lock:
+            key = self._owners.pop(owner.GetAddressAsString(''), None)
+            if key is None:
+                return
+            self._refs[key] -= 1
+            self._evict()
+
+    @contextmanager
+    def detached(self, owners):
+        """Detach the cached textures of ``owners`` for the duration of the ``with`` block.
+
+        Releasing the graphics resources of an actor releases those of its
+        texture too, shared textures are kept out of it this way.
+        """
+        textures = []
+        for owner in owners:
+            texture = owner.GetTexture() if hasattr(owner, 'GetTexture') else None
+            if texture is not None and texture in self:
+                owner.SetTexture(None)
+                textures.append((owner, texture))
+        try:
+            yield
+        finally:
+            for owner, texture in textures:
+                owner.SetTexture(texture)
+
+    def _evict(self):
+        total = self.nbytes
+        for key in list(self._textures):
+            if total <= self.budget:
+                break
+            if self._refs.get(key):
+                continue
+            texture = self._textures.pop(key)
+            total -= self._bytes.pop(key)
+            self._refs.pop(key, None)
+            self._keys.pop(texture.GetAddressAsString(''), None)
+            if self.release_texture is not None:
+                self.release_texture(texture)
+
+    def clear(self):
+        with self._lock:
+            for texture in self._textures.values():
+                if self.release_texture is not None:
+                    self.release_texture(texture)
+            self._textures.clear()
+            self._bytes.clear()
+            self._refs.clear()
+            self._owners.clear()
+            self._keys.clear()
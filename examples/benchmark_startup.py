@@ -0,0 +1,85 @@
+"""Guard the import time and time-to-first-frame of QMLPyVista.
+
+Each measurement runs in a fresh interpreter so module caches do not hide
+regressions. The script exits with a non-zero status when the best of
+``--repeat`` runs is slower than the given limits, e.g.
+
+    python examples/benchmark_startup.py --max-import 1.5 --max-first-frame 4
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT = '''
+import time
+start = time.perf_counter()
+import QMLPyVista.QVTKFrameBufferObjectItem
+print(time.perf_counter() - start)
+'''
+
+
+def _run(*args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    out = subprocess.run([sys.executable, *args], env=env, check=True, capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def import_time():
+    return _run('-c', _IMPORT)
+
+
+def first_frame_time():
+    return _run(os.path.abspath(__file__), '--first-frame-child')
+
+
+def _first_frame_child():
+    start = time.perf_counter()
+    from QMLPyVista.headless import HeadlessSession
+    session = HeadlessSession()
+    try:
+        session.wait_for_frame()
+    except TimeoutError:
+        # Never rendered, reported as a failure whatever the limit
+        print(float('inf'))
+        return
+    print(time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-import', type=float, default=None, help='Limit for the import time in seconds')
+    parser.add_argument('--max-first-frame', type=float, default=None, help='Limit for the first frame in seconds')
+    parser.add_argument('--first-frame-child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.first_frame_child:
+        return _first_frame_child()
+
+    results = {
+        'import': min(import_time() for _ in range(args.repeat)),
+        'first frame': min(first_frame_time() for _ in range(args.repeat)),
+    }
+    limits = {'import': args.max_import, 'first frame': args.max_first_frame}
+
+    failed = False
+    for name, value in results.items():
+        limit = limits[name]
+        status = ''
+        if value == float('inf'):
+            status = 'FAIL (no frame)'
+            failed = True
+        elif limit is not None:
+            status = 'ok' if value <= limit else f'FAIL (limit {limit:.3f}s)'
+            failed = failed or value > limit
+        print(f'{name:>12}: {value:.3f}s {status}')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
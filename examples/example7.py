@@ -9,22 +9,25 @@ import PySide2.QtGui as QtGui
 import numpy as np
 
 from QMLPyVista.QVTKFrameBufferObjectItem import FboItem
+from QMLPyVista.dataset_cache import DatasetCache
 
 import sys
 
-import vtk
+from vtkmodules.vtkCommonColor import vtkNamedColors
+from vtkmodules.vtkInteractionStyle import vtkInteractorStyleTrackballCamera
+from vtkmodules.vtkRenderingCore import vtkPropPicker, vtkProperty
 
-colors = vtk.vtkNamedColors()
+colors = vtkNamedColors()
 
 
-class MouseInteractorHighLightActor(vtk.vtkInteractorStyleTrackballCamera):
+class MouseInteractorHighLightActor(vtkInteractorStyleTrackballCamera):
 
     def __init__(self, parent=None, ren_win=None, ren=None):
         self.AddObserver("LeftButtonPressEvent", self.leftButtonPressEvent)
         self.ren_win = ren_win
         self.renderers = ren
         self.LastPickedActor = None
-        self.LastPickedProperty = vtk.vtkProperty()
+        self.LastPickedProperty = vtkProperty()
 
     def leftButtonPressEvent(self, obj, event):
         clickPos = self.GetInteractor().GetEventPosition()
@@ -34,7 +37,7 @@ class MouseInteractorHighLightActor(vtk.vtkInteractorStyleTrackballCamera):
 
         clickPos = [clickPos[0], window_size[1] + clickPos[1]]
 
-        picker = vtk.vtkPropPicker()
+        picker = vtkPropPicker()
         # renderer = self.GetDefaultRenderer()
         # print(renderer)
         picked_actor = None
@@ -116,6 +119,9 @@ class App(QApplication):
 
 class MyExamples:
 
+    def __init__(self):
+        # Downloaded and decimated meshes are kept on disk between sessions
+        self.cache = DatasetCache()
 
     def gif(self, fbo):
         import pyvista as pv
@@ -196,7 +202,7 @@ class MyExamples:
         import numpy as np
         # Extract the data archive and load these files
         # 2D array of XYZ coordinates
-        path = examples.download_gpr_path().points
+        path = self.cache.fetch(examples.download_gpr_path).points
         # 2D array of the data values from the imaging equipment
         data = examples.download_gpr_data_array()
 
@@ -245,8 +251,9 @@ class MyExamples:
         from pyvista import examples
 
         # download mesh
-        mesh = examples.download_cow()
-        decimated = mesh.decimate_boundary(target_reduction=0.75)
+        mesh = self.cache.fetch(examples.download_cow)
+        decimated = self.cache.fetch(examples.download_cow, lambda: mesh.decimate_boundary(target_reduction=0.75),
+                                     filter='decimate_boundary', target_reduction=0.75)
 
         fbo.set_subplots((1, 2))
         fbo.subplot(0, 0)
@@ -275,8 +282,9 @@ class MyExamples:
         from pyvista import examples
 
         # download mesh
-        mesh = examples.download_cow()
-        decimated = mesh.decimate_boundary(target_reduction=0.75)
+        mesh = self.cache.fetch(examples.download_cow)
+        decimated = self.cache.fetch(examples.download_cow, lambda: mesh.decimate_boundary(target_reduction=0.75),
+                                     filter='decimate_boundary', target_reduction=0.75)
 
         fbo.set_subplots((1, 2))
         fbo.subplot(0, 0)
@@ -299,16 +307,12 @@ class MyExamples:
 
         fbo.open_gif("linked.gif")
 
-        # Update camera and write a frame for each updated position
+        # Render one frame per camera position, each rendered only once
         nframe = 15
-        for i in range(nframe):
-            fbo.camera_position = [
-                (15 * np.cos(i * np.pi / 45.0), 5.0, 15 * np.sin(i * np.pi / 45.0)),
-                (0, 0, 0),
-                (0, 1, 0),
-            ]
-            # fbo.update()
-            fbo.write_frame()
+        positions = [[(15 * np.cos(i * np.pi / 45.0), 5.0, 15 * np.sin(i * np.pi / 45.0)), (0, 0, 0), (0, 1, 0)]
+                     for i in range(nframe)]
+        for image in fbo.render_batch(positions):
+            fbo.mwriter.append_data(image)
 
 
 class canvasHandler(QObject):
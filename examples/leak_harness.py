@@ -0,0 +1,131 @@
+"""Guard against memory growth of long-running QMLPyVista sessions.
+
+Drives an offscreen ``FboItem`` through repeated cycles of adding and
+removing meshes, growing and shrinking subplots, image captures and
+frame recording. After ``--warmup`` cycles it tracks the Python heap with
+tracemalloc, the number of VTK objects held from Python or by the render
+window and the process RSS, and exits with a non-zero status when any of
+them grew by more than its limit, 2 MiB of heap, 50 MiB of RSS and 20 VTK
+objects by default, e.g.
+
+    python examples/leak_harness.py --cycles 50 --max-rss 100
+"""
+import argparse
+import gc
+import os
+import resource
+import sys
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def rss_bytes():
+    """Return the resident set size of this process."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # Peak rather than current size where /proc is not available
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def live_vtk_objects():
+    """Count the VTK objects reachable from Python."""
+    from vtkmodules.vtkCommonCore import vtkObjectBase
+    gc.collect()
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, vtkObjectBase))
+
+
+def render_window_objects(ren_win):
+    """Count the renderers of ``ren_win`` and the props they hold, which Python may not reference."""
+    renderers = ren_win.GetRenderers()
+    count = renderers.GetNumberOfItems()
+    for i in range(count):
+        count += renderers.GetItemAsObject(i).GetViewProps().GetNumberOfItems()
+    return count
+
+
+def sample(session):
+    gc.collect()
+    vtk = live_vtk_objects() + render_window_objects(session.item.ren_win)
+    return {'heap': tracemalloc.get_traced_memory()[0], 'vtk': vtk, 'rss': rss_bytes()}
+
+
+def cycle(session, n_meshes=20):
+    import pyvista
+
+    item = session.item
+    names = [f'mesh-{i}' for i in range(n_meshes)]
+    for i, name in enumerate(names):
+        item.add_mesh(pyvista.Sphere(center=(i, 0, 0)), name=name, reset_camera=False)
+    session.wait_for_frame()
+    for name in names:
+        item.remove_actor(name, reset_camera=False, render=False)
+    session.wait_for_frame()
+
+    item.set_subplots((2, 2))
+    for row in range(2):
+        for column in range(2):
+            item.subplot(row, column)
+            item.add_mesh(pyvista.Cube(), name='cube', reset_camera=False)
+    session.wait_for_frame()
+    item.set_subplots((1, 1))
+    item.subplot(0, 0)
+    session.wait_for_frame()
+
+    item.image  # captured through the render thread
+    item.add_mesh(pyvista.Cone(), name='cone')
+    item.write_frame()
+    item.remove_actor('cone', reset_camera=False, render=False)
+    session.wait_for_frame()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--max-heap', type=float, default=2.0, help='Limit for the Python heap growth in MiB')
+    parser.add_argument('--max-rss', type=float, default=50.0, help='Limit for the RSS growth in MiB')
+    parser.add_argument('--max-vtk', type=int, default=20, help='Limit for the growth of live VTK objects')
+    args = parser.parse_args()
+
+    from QMLPyVista.headless import HeadlessSession
+
+    session = HeadlessSession()
+    session.wait_for_frame()
+    with tempfile.TemporaryDirectory() as tmp:
+        session.item.open_gif(os.path.join(tmp, 'leak.gif'))
+        for _ in range(args.warmup):
+            cycle(session)
+        tracemalloc.start()
+        start = sample(session)
+        for i in range(args.cycles):
+            cycle(session)
+            current = sample(session)
+            print(f'cycle {i + 1:>4}: heap {(current["heap"] - start["heap"]) / 2 ** 20:+8.2f} MiB, '
+                  f'rss {(current["rss"] - start["rss"]) / 2 ** 20:+8.2f} MiB, '
+                  f'vtk objects {current["vtk"] - start["vtk"]:+6d}')
+        session.item.mwriter.close()
+    end = sample(session)
+
+    growth = {
+        'heap': ((end['heap'] - start['heap']) / 2 ** 20, args.max_heap, 'MiB'),
+        'rss': ((end['rss'] - start['rss']) / 2 ** 20, args.max_rss, 'MiB'),
+        'vtk objects': (end['vtk'] - start['vtk'], args.max_vtk, ''),
+    }
+    failed = False
+    for name, (value, limit, unit) in growth.items():
+        status = ''
+        if limit is not None:
+            status = 'ok' if value <= limit else f'FAIL (limit {limit}{unit})'
+            failed = failed or value > limit
+        print(f'{name:>12}: {value:+.2f}{unit} {status}')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
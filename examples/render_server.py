@@ -0,0 +1,36 @@
+"""Serve a scene rendered offscreen to remote viewers over a WebSocket.
+
+    python examples/render_server.py --port 8765
+
+Clients connect to ``ws://host:port`` and exchange the messages described
+in ``QMLPyVista.render_server.RenderServer``.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from QMLPyVista.render_server import RenderServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--size', type=int, nargs=2, default=(800, 600))
+    args = parser.parse_args()
+
+    server = RenderServer(port=args.port, host=args.host, size=args.size)
+    server.session.wait_for_frame()
+
+    from pyvista import examples
+    server.item.add_mesh(examples.download_cow(), color='tan', name='cow')
+    server.item.reset_camera()
+    server.item.update()
+    print(f'Serving on ws://{args.host}:{server.port}')
+    sys.exit(server.session.app.exec_())
+
+
+if __name__ == '__main__':
+    main()
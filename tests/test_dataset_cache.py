@@ -0,0 +1,49 @@
+import gc
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pyvista = pytest.importorskip('pyvista')
+
+from QMLPyVista.dataset_cache import DatasetCache, _record_starts
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DatasetCache(str(tmp_path))
+
+
+def test_polydata_round_trip(cache):
+    source = pyvista.Sphere()
+    mesh = cache.fetch('sphere', lambda: source)
+    # Drop every temporary so that freed buffers would show
+    gc.collect()
+    np.testing.assert_array_equal(mesh.faces, source.faces)
+    np.testing.assert_array_equal(mesh.points, source.points)
+    copy = mesh.copy(deep=True)
+    del mesh
+    gc.collect()
+    np.testing.assert_array_equal(copy.faces, source.faces)
+
+
+def test_unstructured_grid_round_trip(cache):
+    source = pyvista.Sphere().delaunay_3d()
+    grid = cache.fetch('delaunay', lambda: source)
+    gc.collect()
+    np.testing.assert_array_equal(grid.cells, source.cells)
+    np.testing.assert_array_equal(grid.celltypes, source.celltypes)
+    np.testing.assert_array_equal(grid.copy(deep=True).cells, source.cells)
+
+
+def test_reload_from_disk(cache):
+    source = pyvista.Cube().triangulate()
+    cache.fetch('cube', lambda: source)
+    mesh = DatasetCache(cache.root).fetch('cube', lambda: pytest.fail('not cached'))
+    gc.collect()
+    np.testing.assert_array_equal(mesh.faces, source.faces)
+
+
+def test_record_starts():
+    legacy = np.array([3, 0, 1, 2, 4, 2, 3, 4, 5, 1, 7])
+    np.testing.assert_array_equal(_record_starts(legacy, 3), [0, 4, 9])
+    assert len(_record_starts(legacy[:0], 0)) == 0